@@ -1,21 +1,142 @@
-from django.contrib import admin
-from django.utils.safestring import mark_safe
+import json
 
+from django.conf import settings
+from django.contrib import admin, messages
+from django.contrib.admin.models import CHANGE, DELETION, LogEntry
+from django.contrib.contenttypes.models import ContentType
+from django.core.files.storage import default_storage
+from django.core.paginator import Paginator
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.forms.models import BaseInlineFormSet
+from django.http import QueryDict, StreamingHttpResponse
+from django.utils.html import format_html
+
+from .autocomplete import SOURCES, AutocompleteWidget
+from .cache import invalidate, post_scopes
+from .export import FORMATS, export_queryset, iter_export
+from .filters import searchable_filter
+from .images import rendition_name
 from .models import Location, Category, Post, Comment
+from .paginator import EstimatedCountPaginator
+from .search import is_supported, search_posts
 
 admin.site.empty_value_display = "Не задано"
 
+# Параметр адреса со страницей комментариев на странице публикации
+COMMENTS_PAGE_VAR = "comments_page"
+
+
+def chunked(ids, size):
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+def log_bulk_action(request, objects, action_flag, change_message=""):
+    """Журнал админки для массового действия: один INSERT на пачку."""
+    objects = list(objects)
+    if not objects:
+        return
+    content_type = ContentType.objects.get_for_model(objects[0])
+    LogEntry.objects.bulk_create([
+        LogEntry(
+            user_id=request.user.pk,
+            content_type_id=content_type.pk,
+            object_id=str(obj.pk),
+            object_repr=str(obj)[:200],
+            action_flag=action_flag,
+            change_message=change_message,
+        )
+        for obj in objects
+    ])
+
 
 class BlogAdmin(admin.ModelAdmin):
     """Общий интерфейс админ-панели блог."""
 
     list_editable = ("is_published",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = settings.BLOG_ADMIN_FULL_RESULT_COUNT
+    actions = ("publish", "unpublish")
+
+    def get_cache_scopes(self, queryset):
+        """Области кэша, которые затрагивают выбранные записи."""
+        return set()
+
+    def set_published(self, request, queryset, value):
+        # Области считаются до изменения: страницы прежних категорий
+        # тоже нужно сбросить
+        scopes = self.get_cache_scopes(queryset)
+        ids = list(queryset.values_list("pk", flat=True))
+        change_message = json.dumps([{"changed": {"fields": [str(
+            self.model._meta.get_field("is_published").verbose_name
+        )]}}])
+        updated = 0
+        with transaction.atomic():
+            for chunk in chunked(ids, settings.BLOG_ADMIN_BULK_CHUNK_SIZE):
+                chunk_queryset = self.model.objects.filter(pk__in=chunk)
+                log_bulk_action(
+                    request, chunk_queryset, CHANGE, change_message
+                )
+                updated += chunk_queryset.update(is_published=value)
+        # Один сброс кэша вместо сигнала на каждую строку
+        invalidate(scopes)
+        self.message_user(
+            request, f"Изменено записей: {updated}.", messages.SUCCESS
+        )
+
+    @admin.action(
+        description="Опубликовать выбранные записи",
+        permissions=("change",),
+    )
+    def publish(self, request, queryset):
+        self.set_published(request, queryset, True)
+
+    @admin.action(
+        description="Снять с публикации выбранные записи",
+        permissions=("change",),
+    )
+    def unpublish(self, request, queryset):
+        self.set_published(request, queryset, False)
 
 
-class CommentAdmin(admin.TabularInline):
+class CommentInlineFormSet(BaseInlineFormSet):
+    """Комментарии публикации постранично: одна страница на форму."""
+
+    page_number = 1
+    page_size = 50
+    query_params = QueryDict()
+
+    def page_query(self, number):
+        # Фильтры списка и прочие параметры адреса сохраняются
+        query = self.query_params.copy()
+        query[COMMENTS_PAGE_VAR] = number
+        return query.urlencode()
+
+    @property
+    def previous_page_query(self):
+        return self.page_query(self.page.previous_page_number())
+
+    @property
+    def next_page_query(self):
+        return self.page_query(self.page.next_page_number())
+
+    def get_queryset(self):
+        if not hasattr(self, "page"):
+            self.page = Paginator(
+                super().get_queryset(), self.page_size
+            ).get_page(self.page_number)
+            self._queryset = self.page.object_list
+        return self._queryset
+
+
+class CommentInline(admin.TabularInline):
     """Интерфейс для комментариев."""
 
     model = Comment
+    formset = CommentInlineFormSet
+    template = "admin/blog/comment_inline.html"
     readonly_fields = (
         "text",
         "author",
@@ -23,12 +144,22 @@ class CommentAdmin(admin.TabularInline):
     )
     extra = 0
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related("author")
+
+    def get_formset(self, request, obj=None, **kwargs):
+        formset = super().get_formset(request, obj, **kwargs)
+        formset.page_number = request.GET.get(COMMENTS_PAGE_VAR, 1)
+        formset.query_params = request.GET
+        formset.page_size = settings.BLOG_ADMIN_COMMENTS_PER_PAGE
+        return formset
+
 
 @admin.register(Post)
 class PostAdmin(BlogAdmin):
     """Интерфейс для постов."""
 
-    inlines = [CommentAdmin]
+    inlines = [CommentInline]
 
     list_display = (
         "title",
@@ -44,9 +175,10 @@ class PostAdmin(BlogAdmin):
     )
     list_filter = (
         "is_published",
-        "category",
-        "location",
-        "author",
+        "pub_date",
+        ("category", searchable_filter("title")),
+        ("location", searchable_filter("name")),
+        ("author", searchable_filter("username")),
     )
     fields = (
         "is_published",
@@ -60,16 +192,70 @@ class PostAdmin(BlogAdmin):
         "image",
     )
     readonly_fields = ("get_post_img",)
+    autocomplete_fields = ("author",)
     save_on_top = True
+    actions = BlogAdmin.actions + ("export_csv", "export_jsonl")
+
+    def get_cache_scopes(self, queryset):
+        return post_scopes(queryset)
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        # Категории и местоположения подсказываются тем же поиском по
+        # префиксу, что и в форме на сайте
+        if db_field.name in SOURCES:
+            kwargs["widget"] = AutocompleteWidget(db_field.name)
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+    def export(self, queryset, fmt):
+        # Ответ собирается по мере чтения: вся выборка в память не попадает
+        response = StreamingHttpResponse(
+            iter_export(
+                export_queryset(queryset=queryset),
+                fmt,
+                settings.BLOG_EXPORT_CHUNK_SIZE,
+            ),
+            content_type=f"{FORMATS[fmt]}; charset=utf-8",
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="posts.{fmt}"'
+        )
+        return response
+
+    @admin.action(description="Выгрузить выбранные публикации в CSV")
+    def export_csv(self, request, queryset):
+        return self.export(queryset, "csv")
+
+    @admin.action(description="Выгрузить выбранные публикации в JSON lines")
+    def export_jsonl(self, request, queryset):
+        return self.export(queryset, "jsonl")
+
+    def get_queryset(self, request):
+        # Счётчик комментариев хранится в публикации, связи — одним JOIN
+        return super().get_queryset(request).select_related(
+            "author", "category", "location"
+        )
+
+    def get_search_results(self, request, queryset, search_term):
+        # Поиск по индексу FTS5 вместо LIKE по всей таблице
+        if not search_term or not is_supported(queryset.db):
+            return super().get_search_results(
+                request, queryset, search_term
+            )
+        return search_posts(queryset, search_term), False
 
     @admin.display(description="Изображение")
     def get_post_img(self, obj):
-        if obj.image:
-            return mark_safe(f"<img src='{obj.image.url}' width=50")
-
-    @admin.display(description="Комментарии")
-    def comment_count(self, obj):
-        return obj.comments.count()
+        if not obj.image:
+            return None
+        # Уменьшенная копия, пока она не готова — оригинал
+        url = obj.image.url
+        if obj.image_dimensions:
+            url = default_storage.url(
+                rendition_name(obj.image.name, "thumb", "jpeg")
+            )
+        return format_html(
+            "<img src='{}' width=50 loading='lazy' alt=''>", url
+        )
 
 
 @admin.register(Category)
@@ -82,6 +268,16 @@ class CategoryAdmin(BlogAdmin):
         "created_at",
         "slug",
     )
+    search_fields = ("^title",)
+
+    def get_cache_scopes(self, queryset):
+        return (
+            {"choices:category"}
+            | {f"category:{slug}" for slug in queryset.values_list(
+                "slug", flat=True
+            )}
+            | post_scopes(Post.objects.filter(category__in=queryset))
+        )
 
 
 @admin.register(Location)
@@ -93,3 +289,65 @@ class LocationAdmin(BlogAdmin):
         "is_published",
         "created_at",
     )
+    search_fields = ("^name",)
+
+    def get_cache_scopes(self, queryset):
+        return {"choices:location"} | post_scopes(
+            Post.objects.filter(location__in=queryset)
+        )
+
+
+@admin.register(Comment)
+class CommentAdmin(admin.ModelAdmin):
+    """Интерфейс для комментариев."""
+
+    list_display = (
+        "text",
+        "post",
+        "author",
+        "created_at",
+    )
+    list_select_related = ("post", "author")
+    raw_id_fields = ("post", "author")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = settings.BLOG_ADMIN_FULL_RESULT_COUNT
+    actions = ("delete_comments",)
+
+    @admin.action(
+        description="Удалить выбранные комментарии одним запросом",
+        permissions=("delete",),
+    )
+    def delete_comments(self, request, queryset):
+        ids = list(queryset.values_list("pk", flat=True))
+        post_ids = list(
+            queryset.order_by().values_list("post_id", flat=True).distinct()
+        )
+        scopes = post_scopes(Post.objects.filter(pk__in=post_ids))
+        comments = Comment.objects.filter(
+            post=OuterRef("pk")
+        ).order_by().values("post").annotate(
+            total=Count("pk")
+        ).values("total")
+        size = settings.BLOG_ADMIN_BULK_CHUNK_SIZE
+        deleted = 0
+        with transaction.atomic(using=queryset.db):
+            # Без сигналов на каждую строку: счётчики комментариев
+            # пересчитываются ниже одним UPDATE на пачку публикаций.
+            # _raw_delete — DELETE ... WHERE id IN без сбора связанных
+            # объектов; на комментарии никто не ссылается, а Django
+            # закреплён на 3.2 в requirements.txt
+            for chunk in chunked(ids, size):
+                chunk_queryset = Comment.objects.filter(pk__in=chunk)
+                log_bulk_action(
+                    request, chunk_queryset.select_related("author"),
+                    DELETION,
+                )
+                deleted += chunk_queryset._raw_delete(queryset.db)
+            for chunk in chunked(post_ids, size):
+                Post.objects.filter(pk__in=chunk).update(
+                    comment_count=Coalesce(Subquery(comments), 0)
+                )
+        invalidate(scopes)
+        self.message_user(
+            request, f"Удалено комментариев: {deleted}.", messages.SUCCESS
+        )
@@ -0,0 +1,107 @@
+"""Подсказки для полей категории и местоположения.
+
+Поиск по началу названия без учёта регистра идёт по индексу
+поискового столбца опубликованных записей и возвращает не больше
+`LIMIT` строк. Ответы кэшируются по префиксу
+до изменения записей (области `choices:<вид>`).
+"""
+import hashlib
+
+from django import forms
+from django.conf import settings
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils.html import format_html
+
+from .cache import get_versions
+from .models import Category, Location
+from .utils import search_key
+
+CHOICES_KEY = 'blog:choices:{}:{}:{}'
+LIMIT = 10
+
+SOURCES = {
+    'category': (Category, 'title', 'search_title'),
+    'location': (Location, 'name', 'search_name'),
+}
+
+
+def prefix_filter(field, query):
+    """Диапазон по индексу столбца с названием в `search_key()`.
+
+    LIKE в SQLite не различает регистр только латиницы и не использует
+    индекс, поэтому префикс ищется сравнением строк.
+    """
+    prefix = search_key(query)
+    return {f'{field}__gte': prefix, f'{field}__lt': prefix + chr(0x10FFFF)}
+
+
+def search_choices(kind, query, limit=LIMIT):
+    """Опубликованные записи, название которых начинается с `query`."""
+    model, label_field, search_field = SOURCES[kind]
+    query = query.strip()
+    version, = get_versions([f'choices:{kind}'])
+    key = CHOICES_KEY.format(
+        kind, version,
+        hashlib.md5(f'{limit}|{search_key(query)}'.encode()).hexdigest(),
+    )
+    choices = cache.get(key)
+    if choices is None:
+        queryset = model.objects.filter(is_published=True)
+        if query:
+            queryset = queryset.filter(**prefix_filter(search_field, query))
+        choices = [
+            {'id': pk, 'text': label}
+            for pk, label in queryset.order_by(search_field).values_list(
+                'pk', label_field
+            )[:limit]
+        ]
+        cache.set(key, choices, settings.BLOG_AUTOCOMPLETE_CACHE_TIMEOUT)
+    return choices
+
+
+class AutocompleteWidget(forms.Widget):
+    """Текстовое поле с подсказками вместо списка всех записей.
+
+    Выбранный id уходит в скрытом поле с именем поля формы.
+    """
+
+    class Media:
+        js = ('js/autocomplete.js',)
+
+    def __init__(self, kind, attrs=None):
+        super().__init__(attrs)
+        self.kind = kind
+
+    def get_label(self, value):
+        if value in (None, ''):
+            return ''
+        model, label_field, _ = SOURCES[self.kind]
+        # Снятая с публикации запись тоже подписывается, если выбрана
+        return model.objects.filter(pk=value).values_list(
+            label_field, flat=True
+        ).first() or ''
+
+    def render(self, name, value, attrs=None, renderer=None):
+        attrs = self.build_attrs(self.attrs, attrs)
+        input_id = attrs.pop('id', f'id_{name}')
+        required = attrs.pop('required', False)
+        css_class = attrs.pop('class', '').split()
+        if 'form-control' not in css_class:
+            css_class.append('form-control')
+        return format_html(
+            '<div data-autocomplete-url="{}">'
+            '<input type="hidden" name="{}" value="{}">'
+            '<input type="text" id="{}" class="{}" value="{}"'
+            ' list="{}_list" autocomplete="off"{}>'
+            '<datalist id="{}_list"></datalist>'
+            '</div>',
+            reverse('blog:autocomplete', args=[self.kind]),
+            name, '' if value is None else value,
+            input_id, ' '.join(css_class), self.get_label(value),
+            input_id, ' required' if required else '',
+            input_id,
+        )
+
+    def value_omitted_from_data(self, data, files, name):
+        return name not in data
@@ -0,0 +1,228 @@
+"""Нагрузочный прогон блога внутри процесса.
+
+Запросы из файла смеси (JSON lines) отправляются прямо в WSGI-приложение
+`blogicum.wsgi.application`; для каждого имени URL считаются перцентили
+времени ответа и число SQL-запросов.
+"""
+import json
+import math
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from datetime import timedelta
+from io import BytesIO
+from wsgiref.util import setup_testing_defaults
+
+from django.contrib.auth import get_user_model
+from django.test import Client
+from django.urls import resolve
+from django.utils import timezone
+from mixer.backend.django import mixer
+
+from .db import apply_pragmas
+from .models import Category, Comment, Location, Post
+
+
+def seed(users, categories, locations, posts, comments, rng):
+    """Заполняет базу случайными данными через mixer."""
+    User = get_user_model()
+    authors = mixer.cycle(users).blend(User)
+    category_objs = mixer.cycle(categories).blend(Category, is_published=True)
+    location_objs = mixer.cycle(locations).blend(Location, is_published=True)
+    post_objs = mixer.cycle(posts).blend(
+        Post,
+        author=(rng.choice(authors) for _ in range(posts)),
+        category=(rng.choice(category_objs) for _ in range(posts)),
+        location=(rng.choice(location_objs) for _ in range(posts)),
+        pub_date=(
+            timezone.now() - timedelta(minutes=rng.randrange(10 ** 6))
+            for _ in range(posts)
+        ),
+        is_published=True,
+        image='',
+    )
+    mixer.cycle(comments).blend(
+        Comment,
+        post=(rng.choice(post_objs) for _ in range(comments)),
+        author=(rng.choice(authors) for _ in range(comments)),
+    )
+    return authors
+
+
+def load_mix(path):
+    with open(path, encoding='utf-8') as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+def percentile(values, percent):
+    """Перцентиль методом ближайшего ранга; None для пустой выборки."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(percent / 100 * len(ordered)) - 1)]
+
+
+class Replayer:
+    def __init__(self, application, author, rng):
+        self.application = application
+        self.rng = rng
+        client = Client()
+        client.force_login(author)
+        self.author_cookie = client.cookies.output(
+            attrs=[], header='', sep=';'
+        ).strip()
+        self.author = author
+        self.post_ids = list(
+            Post.objects.values_list('pk', flat=True)
+        )
+        self.category_slugs = list(
+            Category.objects.values_list('slug', flat=True)
+        )
+        self.usernames = list(
+            Post.objects.values_list('author__username', flat=True).distinct()
+        )
+
+    def build_path(self, template, user):
+        return template.format(
+            post_id=self.rng.choice(self.post_ids),
+            category_slug=self.rng.choice(self.category_slugs),
+            username=(
+                self.author.username if user == 'author'
+                else self.rng.choice(self.usernames)
+            ),
+        )
+
+    def request(self, method, path, user):
+        path_info, _, query = path.partition('?')
+        environ = {
+            'REQUEST_METHOD': method,
+            'PATH_INFO': path_info,
+            'QUERY_STRING': query,
+            'wsgi.input': BytesIO(),
+        }
+        if user == 'author':
+            environ['HTTP_COOKIE'] = self.author_cookie
+        setup_testing_defaults(environ)
+
+        start = time.perf_counter()
+        response = self.application(environ, lambda status, headers: None)
+        b''.join(response)
+        duration = time.perf_counter() - start
+        response.close()
+        stats = getattr(response, 'query_stats', None)
+        return response.status_code, duration, stats.count if stats else 0
+
+    def run(self, mix, total):
+        weights = [entry.get('weight', 1) for entry in mix]
+        samples = defaultdict(lambda: {'durations': [], 'queries': []})
+        for entry in self.rng.choices(mix, weights, k=total):
+            user = entry.get('user', 'anonymous')
+            path = self.build_path(entry['path'], user)
+            status, duration, queries = self.request(
+                entry.get('method', 'GET'), path, user
+            )
+            name = resolve(path.partition('?')[0]).view_name
+            if user != 'anonymous':
+                name = f'{name} ({user})'
+            samples[name]['durations'].append(duration * 1000)
+            samples[name]['queries'].append(queries)
+            samples[name].setdefault('statuses', set()).add(status)
+        return summarize(samples)
+
+
+def summarize(samples):
+    return {
+        name: {
+            'requests': len(data['durations']),
+            'p50_ms': round(percentile(data['durations'], 50), 2),
+            'p95_ms': round(percentile(data['durations'], 95), 2),
+            'p99_ms': round(percentile(data['durations'], 99), 2),
+            'queries': round(sum(data['queries']) / len(data['queries']), 2),
+            'statuses': sorted(data['statuses']),
+        }
+        for name, data in sorted(samples.items())
+    }
+
+
+def compare(results, baseline):
+    """Изменение p95 и числа запросов относительно сохранённого прогона."""
+    rows = {}
+    for name, current in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        rows[name] = {
+            'p95_change_pct': round(
+                (current['p95_ms'] - before['p95_ms'])
+                / before['p95_ms'] * 100, 1
+            ) if before['p95_ms'] else None,
+            'queries_change': round(current['queries'] - before['queries'], 2),
+        }
+    return rows
+
+
+def sqlite_concurrency(path, pragmas, readers=4, writers=2, duration=2.0):
+    """Параллельные чтения и записи в файл SQLite с заданными прагмами.
+
+    Возвращает число операций в секунду, p95 записи и число ошибок
+    «database is locked».
+    """
+    db = sqlite3.connect(path)
+    db.execute(
+        'CREATE TABLE bench (id INTEGER PRIMARY KEY, text TEXT NOT NULL)'
+    )
+    db.executemany(
+        'INSERT INTO bench (text) VALUES (?)',
+        (('x' * 200,) for _ in range(1000)),
+    )
+    db.commit()
+    db.close()
+
+    stats = {'reads': 0, 'writes': 0, 'errors': 0, 'write_ms': []}
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def work(write):
+        db = sqlite3.connect(path)
+        apply_pragmas(db, pragmas)
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            try:
+                if write:
+                    db.execute(
+                        'INSERT INTO bench (text) VALUES (?)', ('y' * 200,)
+                    )
+                    db.commit()
+                else:
+                    db.execute(
+                        'SELECT count(*), max(length(text)) FROM bench'
+                    ).fetchone()
+            except sqlite3.OperationalError:
+                db.rollback()
+                key = 'errors'
+            else:
+                key = 'writes' if write else 'reads'
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                stats[key] += 1
+                if key == 'writes':
+                    stats['write_ms'].append(elapsed)
+        db.close()
+
+    threads = [
+        threading.Thread(target=work, args=(index < writers,))
+        for index in range(readers + writers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return {
+        'reads_per_s': round(stats['reads'] / duration, 1),
+        'writes_per_s': round(stats['writes'] / duration, 1),
+        'write_p95_ms': round(percentile(stats['write_ms'], 95), 2)
+        if stats['write_ms'] else None,
+        'errors': stats['errors'],
+    }
@@ -0,0 +1,66 @@
+import hashlib
+import time
+from uuid import uuid4
+
+from django.core.cache import cache
+
+PAGE_KEY = 'blog:page:{}'
+VERSION_KEY = 'blog:version:{}'
+LAST_PUBLISHED_KEY = 'blog:last_published:{}'
+
+
+def new_version():
+    # Время смены версии нужно для заголовка Last-Modified
+    return f'{time.time():.6f}-{uuid4().hex[:8]}'
+
+
+def version_time(version):
+    """Время создания версии в секундах или None для старых версий."""
+    try:
+        return float(version.partition('-')[0])
+    except ValueError:
+        return None
+
+
+def get_versions(scopes):
+    """Текущие версии областей кэша; недостающие создаются заново."""
+    keys = {scope: VERSION_KEY.format(scope) for scope in scopes}
+    versions = cache.get_many(keys.values())
+    missing = {
+        key: new_version() for key in keys.values() if key not in versions
+    }
+    if missing:
+        cache.set_many(missing, timeout=None)
+        versions.update(missing)
+    return [versions[keys[scope]] for scope in scopes]
+
+
+def get_page_cache_key(request, scopes, *extra):
+    raw = '|'.join([request.get_full_path(), *get_versions(scopes), *extra])
+    return PAGE_KEY.format(hashlib.md5(raw.encode()).hexdigest())
+
+
+def get_last_published_key(scopes, versions):
+    raw = '|'.join([*scopes, *versions])
+    return LAST_PUBLISHED_KEY.format(hashlib.md5(raw.encode()).hexdigest())
+
+
+def invalidate(scopes):
+    """Сбрасывает страницы областей, меняя их версии."""
+    if scopes:
+        cache.set_many(
+            {VERSION_KEY.format(scope): new_version() for scope in scopes},
+            timeout=None,
+        )
+
+
+def post_scopes(posts):
+    """Области кэша, которые затрагивает изменение публикаций."""
+    scopes = {'index'}
+    for pk, slug, username in posts.values_list(
+        'pk', 'category__slug', 'author__username'
+    ).order_by():
+        scopes.update({f'post:{pk}', f'author:{username}'})
+        if slug:
+            scopes.add(f'category:{slug}')
+    return scopes
@@ -0,0 +1,38 @@
+"""Настройка соединений с базой данных.
+
+К каждому новому соединению с SQLite применяются прагмы из
+`SQLITE_PRAGMAS`, а постоянные соединения (`CONN_MAX_AGE`) перед
+запросом проверяются на работоспособность.
+"""
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+def apply_pragmas(db, pragmas):
+    """Выполняет прагмы на соединении sqlite3, минуя обёртки Django."""
+    for name, value in pragmas.items():
+        db.execute(f'PRAGMA {name} = {value}')
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    if connection.vendor == 'sqlite':
+        apply_pragmas(connection.connection, settings.SQLITE_PRAGMAS)
+
+
+@receiver(request_started)
+def check_persistent_connections(**kwargs):
+    # Сам Django проверяет соединение только после ошибки в нём,
+    # и разорванное сервером досталось бы следующему запросу
+    if not settings.DB_HEALTH_CHECKS:
+        return
+    for connection in connections.all():
+        if (
+            connection.connection is not None
+            and connection.settings_dict['CONN_MAX_AGE']
+            and not connection.is_usable()
+        ):
+            connection.close()
@@ -0,0 +1,197 @@
+"""Потоковые импорт и экспорт дампа блога.
+
+Поддерживаются формат `dumpdata` (JSON-массив) и JSON lines, оба также
+в gzip. Файл читается кусками, записи раскладываются по временным
+файлам моделей и вставляются пакетами в порядке зависимостей.
+"""
+import gzip
+import json
+import tempfile
+from contextlib import contextmanager
+
+from django.contrib.auth import get_user_model
+from django.core import serializers
+from django.core.management.color import no_style
+from django.core.serializers.base import DeserializationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+
+from .models import Category, Comment, Location, Post
+from .utils import make_excerpt, search_key
+
+CHUNK_SIZE = 64 * 1024
+
+
+def dump_models():
+    """Модели дампа в порядке зависимостей."""
+    return [get_user_model(), Category, Location, Post, Comment]
+
+
+def model_label(model):
+    return model._meta.label_lower
+
+
+def is_jsonl(path, fmt=None):
+    return (fmt or path.removesuffix('.gz').rsplit('.', 1)[-1]) == 'jsonl'
+
+
+def open_dump(path, mode):
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+def skip_separators(buffer, pos):
+    while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+        pos += 1
+    return pos
+
+
+def iter_json_array(file):
+    """Читает объекты JSON-массива, не загружая его в память целиком."""
+    decoder = json.JSONDecoder()
+    buffer = ''
+    while not buffer:
+        chunk = file.read(CHUNK_SIZE)
+        buffer = chunk.lstrip()
+        if not chunk:
+            break
+    if not buffer.startswith('['):
+        raise DeserializationError('Дамп должен быть JSON-массивом.')
+    buffer = buffer[1:]
+    while True:
+        chunk = file.read(CHUNK_SIZE)
+        buffer += chunk
+        pos = skip_separators(buffer, 0)
+        while pos < len(buffer):
+            if buffer[pos] == ']':
+                return
+            try:
+                record, pos = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # Объект ещё не дочитан
+                break
+            yield record
+            pos = skip_separators(buffer, pos)
+        buffer = buffer[pos:]
+        if not chunk:
+            raise DeserializationError('Дамп оборвался до конца массива.')
+
+
+def iter_json_lines(file):
+    for line in file:
+        if line.strip():
+            yield json.loads(line)
+
+
+def iter_records(path, fmt=None):
+    with open_dump(path, 'r') as file:
+        if is_jsonl(path, fmt):
+            yield from iter_json_lines(file)
+        else:
+            yield from iter_json_array(file)
+
+
+@contextmanager
+def raw_dates(models):
+    """Сохраняет даты из дампа: bulk_create иначе подставит текущие."""
+    fields = [
+        field for model in models for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False)
+        or getattr(field, 'auto_now_add', False)
+    ]
+    saved = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, saved):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def import_dump(path, fmt=None, batch_size=1000, ignore_conflicts=False):
+    """Загружает дамп и возвращает число вставленных и пропущенных записей."""
+    models = dump_models()
+    labels = {model_label(model): model for model in models}
+    spools = {label: tempfile.TemporaryFile('w+t') for label in labels}
+    counts = {label: 0 for label in labels}
+    skipped = 0
+    try:
+        for record in iter_records(path, fmt):
+            spool = spools.get(record.get('model', '').lower())
+            if spool is None:
+                skipped += 1
+                continue
+            spool.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+        with raw_dates(models):
+            for label, model in labels.items():
+                spool = spools[label]
+                spool.seek(0)
+                objects = (
+                    item.object for item in serializers.deserialize(
+                        'python', iter_json_lines(spool),
+                        ignorenonexistent=True,
+                    )
+                )
+                batch = []
+                for obj in objects:
+                    if isinstance(obj, Post) and not obj.excerpt:
+                        obj.excerpt = make_excerpt(obj.text)
+                    elif isinstance(obj, Category):
+                        obj.search_title = search_key(obj.title)
+                    elif isinstance(obj, Location):
+                        obj.search_name = search_key(obj.name)
+                    batch.append(obj)
+                    if len(batch) >= batch_size:
+                        counts[label] += insert_batch(
+                            model, batch, ignore_conflicts
+                        )
+                        batch = []
+                counts[label] += insert_batch(model, batch, ignore_conflicts)
+    finally:
+        for spool in spools.values():
+            spool.close()
+
+    reset_sequences(models)
+    return counts, skipped
+
+
+def insert_batch(model, batch, ignore_conflicts):
+    if not batch:
+        return 0
+    with transaction.atomic():
+        model.objects.bulk_create(batch, ignore_conflicts=ignore_conflicts)
+    return len(batch)
+
+
+def reset_sequences(models):
+    """Сдвигает счётчики первичных ключей после вставки с явными pk."""
+    statements = connection.ops.sequence_reset_sql(no_style(), models)
+    if statements:
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+
+def serialize_object(obj):
+    record = serializers.serialize('python', [obj])[0]
+    return json.dumps(record, ensure_ascii=False, cls=DjangoJSONEncoder)
+
+
+def iter_dump(jsonl=False, chunk_size=2000):
+    """Отдаёт дамп блога кусками текста для записи в файл или ответ."""
+    first = True
+    if not jsonl:
+        yield '['
+    for model in dump_models():
+        for obj in model.objects.order_by('pk').iterator(chunk_size):
+            line = serialize_object(obj)
+            if jsonl:
+                yield line + '\n'
+            else:
+                yield ('\n' if first else ',\n') + line
+            first = False
+    if not jsonl:
+        yield '\n]\n'
@@ -0,0 +1,135 @@
+"""Выгрузка публикаций с комментариями в CSV или JSON lines.
+
+Публикации и комментарии читаются двумя курсорами `.iterator()`
+в одном порядке и сливаются, а результат отдаётся построчно: память
+не растёт ни с числом публикаций, ни с длиной обсуждений.
+"""
+import csv
+import json
+from itertools import groupby
+from operator import attrgetter
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import Comment, Post
+
+FORMATS = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+}
+CSV_FIELDS = (
+    'type', 'id', 'post_id', 'title', 'text', 'date', 'author',
+    'category', 'location', 'is_published',
+)
+
+
+def export_queryset(date_from=None, date_to=None, category=None,
+                    author=None, queryset=None):
+    """Публикации для выгрузки: даты включительно, категория по slug,
+    автор по имени пользователя.
+    """
+    if queryset is None:
+        queryset = Post.objects.all()
+    if date_from:
+        queryset = queryset.filter(pub_date__date__gte=date_from)
+    if date_to:
+        queryset = queryset.filter(pub_date__date__lte=date_to)
+    if category:
+        queryset = queryset.filter(category__slug=category)
+    if author:
+        queryset = queryset.filter(author__username=author)
+    return queryset.select_related(
+        'author', 'category', 'location'
+    ).order_by('pk')
+
+
+def iter_posts_with_comments(queryset, chunk_size=1000):
+    """Пары (публикация, итератор её комментариев).
+
+    Комментарии читаются одним курсором в порядке публикаций и сливаются
+    с ними: итератор нужно дочитать до перехода к следующей паре.
+    """
+    comments = groupby(
+        Comment.objects.filter(
+            post__in=queryset.values('pk')
+        ).select_related('author').order_by(
+            'post_id', 'created_at', 'pk'
+        ).iterator(chunk_size=chunk_size),
+        key=attrgetter('post_id'),
+    )
+    group = next(comments, None)
+    for post in queryset.iterator(chunk_size=chunk_size):
+        while group is not None and group[0] < post.pk:
+            group = next(comments, None)
+        if group is not None and group[0] == post.pk:
+            yield post, group[1]
+            group = next(comments, None)
+        else:
+            yield post, iter(())
+
+
+def post_record(post):
+    return {
+        'id': post.pk,
+        'title': post.title,
+        'text': post.text,
+        'pub_date': post.pub_date,
+        'is_published': post.is_published,
+        'author': post.author.username,
+        'category': post.category.slug if post.category else None,
+        'location': post.location.name if post.location else None,
+    }
+
+
+def comment_record(comment):
+    return {
+        'id': comment.pk,
+        'text': comment.text,
+        'created_at': comment.created_at,
+        'author': comment.author.username,
+    }
+
+
+class Echo:
+    """Файл для csv.writer, который возвращает строку вместо записи."""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(CSV_FIELDS)
+    for post, comments in rows:
+        record = post_record(post)
+        yield writer.writerow([
+            'post', record['id'], '', record['title'], record['text'],
+            record['pub_date'].isoformat(), record['author'],
+            record['category'] or '', record['location'] or '',
+            record['is_published'],
+        ])
+        for comment in map(comment_record, comments):
+            yield writer.writerow([
+                'comment', comment['id'], record['id'], '', comment['text'],
+                comment['created_at'].isoformat(), comment['author'],
+                '', '', '',
+            ])
+
+
+def to_json(record):
+    return json.dumps(record, ensure_ascii=False, cls=DjangoJSONEncoder)
+
+
+def iter_jsonl(rows):
+    # Строка публикации отдаётся частями: комментарии не копятся в списке
+    for post, comments in rows:
+        yield to_json(post_record(post))[:-1] + ', "comments": ['
+        for index, comment in enumerate(comments):
+            yield (', ' if index else '') + to_json(comment_record(comment))
+        yield ']}\n'
+
+
+def iter_export(queryset, fmt='csv', chunk_size=1000):
+    """Строки выгрузки в формате `csv` или `jsonl`."""
+    rows = iter_posts_with_comments(queryset, chunk_size)
+    return iter_csv(rows) if fmt == 'csv' else iter_jsonl(rows)
@@ -0,0 +1,129 @@
+"""Ленты Atom и RSS: весь блог, категория и автор.
+
+XML отдаётся потоком: сначала шапка ленты, затем по одной записи.
+Готовая лента кэшируется по версиям тех же областей, что и страницы.
+"""
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed, Rss201rev2Feed
+from django.utils.xmlutils import SimplerXMLGenerator
+
+
+class StreamingFeedMixin:
+    """Генератор `stream()` вместо записи ленты в файл целиком.
+
+    Классы лент задают `item_element` и методы `start_root(handler)`
+    и `end_root(handler)`, которые открывают и закрывают корень ленты.
+    """
+
+    item_element = None
+
+    def stream(self, encoding='utf-8'):
+        buffer = StringIO()
+        handler = SimplerXMLGenerator(buffer, encoding)
+        handler.startDocument()
+        self.start_root(handler)
+        yield flush(buffer)
+        for item in self.items:
+            handler.startElement(self.item_element, self.item_attributes(item))
+            self.add_item_elements(handler, item)
+            handler.endElement(self.item_element)
+            yield flush(buffer)
+        self.end_root(handler)
+        yield flush(buffer)
+
+
+def flush(buffer):
+    chunk = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return chunk
+
+
+class StreamingAtom1Feed(StreamingFeedMixin, Atom1Feed):
+    item_element = 'entry'
+
+    def start_root(self, handler):
+        handler.startElement('feed', self.root_attributes())
+        self.add_root_elements(handler)
+
+    def end_root(self, handler):
+        handler.endElement('feed')
+
+
+class StreamingRssFeed(StreamingFeedMixin, Rss201rev2Feed):
+    item_element = 'item'
+
+    def start_root(self, handler):
+        handler.startElement('rss', self.rss_attributes())
+        handler.startElement('channel', self.root_attributes())
+        self.add_root_elements(handler)
+
+    def end_root(self, handler):
+        self.endChannelElement(handler)
+        handler.endElement('rss')
+
+
+FEED_TYPES = {
+    'atom': StreamingAtom1Feed,
+    'rss': StreamingRssFeed,
+}
+
+
+class PostFeed(Feed):
+    """Последние публикации.
+
+    Объект ленты — словарь из представления: title, link, description
+    и posts.
+    """
+
+    def __init__(self, feed_format='atom'):
+        super().__init__()
+        self.feed_type = FEED_TYPES[feed_format]
+
+    def title(self, obj):
+        return obj['title']
+
+    def link(self, obj):
+        return obj['link']
+
+    def description(self, obj):
+        return obj['description']
+
+    def items(self, obj):
+        return obj['posts'].select_related(
+            'author', 'category'
+        ).order_by('-pub_date')[:settings.BLOG_FEED_ITEMS]
+
+    def item_title(self, post):
+        return post.title
+
+    def item_link(self, post):
+        return reverse('blog:post_detail', args=[post.pk])
+
+    def item_description(self, post):
+        return post.text
+
+    def item_pubdate(self, post):
+        return post.pub_date
+
+    def item_author_name(self, post):
+        return post.author.get_full_name() or post.author.username
+
+    def item_categories(self, post):
+        return [post.category.title] if post.category else []
+
+
+def cache_chunks(chunks, key, timeout):
+    """Отдаёт куски ленты дальше и кладёт ленту в кэш, когда она
+    дописана до конца.
+    """
+    written = []
+    for chunk in chunks:
+        written.append(chunk)
+        yield chunk
+    cache.set(key, ''.join(written), timeout)
@@ -0,0 +1,83 @@
+from django.contrib import admin
+from django.contrib.admin.utils import get_model_from_relation
+from django.utils.translation import gettext_lazy as _
+
+
+class SearchableRelatedFilter(admin.FieldListFilter):
+    """Фильтр по связанной записи без загрузки всей таблицы.
+
+    Вместо списка всех значений — поле поиска по `search_field`
+    и не больше `limit` найденных вариантов.
+    """
+
+    template = 'admin/blog/searchable_filter.html'
+    search_field = None
+    limit = 10
+
+    def __init__(self, field, request, params, model, model_admin,
+                 field_path):
+        self.related_model = get_model_from_relation(field)
+        self.lookup_kwarg = f'{field_path}__{field.target_field.name}__exact'
+        self.search_kwarg = f'{field_path}_q'
+        self.lookup_val = params.get(self.lookup_kwarg)
+        self.search_val = params.get(self.search_kwarg, '').strip()
+        super().__init__(
+            field, request, params, model, model_admin, field_path
+        )
+        self.hidden_params = []
+
+    def has_output(self):
+        return True
+
+    def expected_parameters(self):
+        return [self.lookup_kwarg, self.search_kwarg]
+
+    def queryset(self, request, queryset):
+        if self.lookup_val:
+            return queryset.filter(**{self.lookup_kwarg: self.lookup_val})
+        return queryset
+
+    def get_matches(self):
+        matches = self.related_model._default_manager.order_by(
+            self.search_field
+        )
+        if self.search_val:
+            matches = matches.filter(**{
+                f'{self.search_field}__istartswith': self.search_val
+            })
+        elif self.lookup_val:
+            matches = matches.filter(pk=self.lookup_val)
+        else:
+            return []
+        return matches[:self.limit]
+
+    def choices(self, changelist):
+        # Остальные параметры списка сохраняются в форме поиска
+        self.hidden_params = [
+            (key, value) for key, value in changelist.params.items()
+            if key not in (self.search_kwarg, self.lookup_kwarg)
+        ]
+        yield {
+            'selected': self.lookup_val is None,
+            'query_string': changelist.get_query_string(
+                remove=[self.lookup_kwarg, self.search_kwarg]
+            ),
+            'display': _('All'),
+        }
+        for obj in self.get_matches():
+            yield {
+                'selected': self.lookup_val == str(obj.pk),
+                'query_string': changelist.get_query_string(
+                    {self.lookup_kwarg: obj.pk}, [self.search_kwarg]
+                ),
+                'display': str(obj),
+            }
+
+
+def searchable_filter(search_field):
+    """Класс фильтра для `list_filter` с поиском по полю связанной модели."""
+    return type(
+        'SearchableRelatedFilter',
+        (SearchableRelatedFilter,),
+        {'search_field': search_field},
+    )
@@ -1,5 +1,9 @@
 from django import forms
+from django.contrib.auth.forms import PasswordResetForm
 
+from tasks.mail import send_password_reset_email
+
+from .autocomplete import AutocompleteWidget
 from .models import Comment, Post, User
 
 
@@ -20,6 +24,8 @@ class PostEditForm(forms.ModelForm):
                 attrs={'type': 'datetime-local'},
                 format='%Y-%m-%d %H:%M',
             ),
+            'category': AutocompleteWidget('category'),
+            'location': AutocompleteWidget('location'),
         }
 
 
@@ -28,3 +34,27 @@ class UserEditForm(forms.ModelForm):
     class Meta:
         model = User
         fields = ('first_name', 'last_name', 'username', 'email')
+
+
+class QueuedPasswordResetForm(PasswordResetForm):
+    """Письмо для сброса пароля отправляется фоновой задачей.
+
+    В задачу попадают только id пользователя и адрес: токен и ссылку
+    воркер строит сам, чтобы они не хранились в очереди.
+    """
+
+    def send_mail(self, subject_template_name, email_template_name,
+                  context, from_email, to_email,
+                  html_email_template_name=None):
+        send_password_reset_email.delay(
+            context['user'].pk,
+            to_email,
+            {
+                key: context[key]
+                for key in ('domain', 'site_name', 'protocol')
+            },
+            subject_template_name,
+            email_template_name,
+            from_email,
+            html_email_template_name,
+        )
@@ -0,0 +1,89 @@
+import logging
+import posixpath
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+from tasks.utils import background
+
+logger = logging.getLogger(__name__)
+
+# Ширина уменьшенных копий изображения публикации
+RENDITIONS = {
+    'thumb': 100,
+    'card': 640,
+    'detail': 1200,
+}
+FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+
+def rendition_name(name, rendition, fmt):
+    directory, filename = posixpath.split(name)
+    stem = posixpath.splitext(filename)[0]
+    return posixpath.join(
+        directory, 'renditions', f'{stem}_{rendition}.{fmt}'
+    )
+
+
+def rendition_size(width, height, rendition):
+    """Размер копии: не шире заданного и без увеличения оригинала."""
+    new_width = min(RENDITIONS[rendition], width)
+    return new_width, max(1, round(height * new_width / width))
+
+
+def has_renditions(name):
+    return default_storage.exists(rendition_name(name, 'card', 'webp'))
+
+
+def generate_renditions(name):
+    """Создаёт копии изображения во всех размерах и форматах.
+
+    Возвращает размер оригинала в виде `1600x900` или пустую строку,
+    если изображение не удалось прочитать.
+    """
+    try:
+        with default_storage.open(name) as file:
+            image = ImageOps.exif_transpose(Image.open(file))
+            image.load()
+    except (OSError, Image.DecompressionBombError):
+        logger.warning('Не удалось открыть изображение %s', name)
+        return ''
+
+    width, height = image.size
+    for rendition in RENDITIONS:
+        resized = image.resize(
+            rendition_size(width, height, rendition),
+            Image.Resampling.LANCZOS,
+        )
+        for fmt, (pil_format, options) in FORMATS.items():
+            converted = resized
+            if pil_format == 'JPEG' and resized.mode != 'RGB':
+                converted = resized.convert('RGB')
+            elif resized.mode not in ('RGB', 'RGBA'):
+                converted = resized.convert('RGBA')
+            buffer = BytesIO()
+            converted.save(buffer, pil_format, **options)
+            path = rendition_name(name, rendition, fmt)
+            default_storage.delete(path)
+            default_storage.save(path, ContentFile(buffer.getvalue()))
+    return f'{width}x{height}'
+
+
+@background
+def process_post_image(post_id):
+    """Готовит копии изображения публикации и сохраняет его размер."""
+    from .cache import invalidate, post_scopes
+    from .models import Post
+
+    posts = Post.objects.filter(pk=post_id)
+    post = posts.only('pk', 'image').first()
+    if post is None or not post.image:
+        return
+    posts.update(image_size=generate_renditions(post.image.name))
+    # Карточки и страницы публикации должны получить новые размеры
+    invalidate(post_scopes(posts))
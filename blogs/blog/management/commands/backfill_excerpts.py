@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blog.models import Post
+from blog.utils import make_excerpt
+
+
+class Command(BaseCommand):
+    help = 'Заполняет сохранённое начало текста публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Количество публикаций, обновляемых за один запрос.',
+        )
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            dest='recompute_all',
+            help='Пересчитать начало текста у всех публикаций, '
+            'а не только у пустых.',
+        )
+
+    def handle(self, *args, batch_size, recompute_all, **options):
+        posts = Post.objects.only('pk', 'text').order_by('pk')
+        if not recompute_all:
+            posts = posts.filter(excerpt='')
+
+        updated = 0
+        batch = []
+        for post in posts.iterator(chunk_size=batch_size):
+            post.excerpt = make_excerpt(post.text)
+            batch.append(post)
+            if len(batch) >= batch_size:
+                updated += self.save_batch(batch)
+                batch = []
+        updated += self.save_batch(batch)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Обновлено публикаций: {updated}.'
+        ))
+
+    def save_batch(self, batch):
+        if batch:
+            with transaction.atomic():
+                Post.objects.bulk_update(batch, ['excerpt'])
+        return len(batch)
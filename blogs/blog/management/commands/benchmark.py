@@ -0,0 +1,104 @@
+import json
+import random
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import (
+    setup_test_environment,
+    teardown_test_environment,
+)
+
+from blog.benchmark import Replayer, compare, load_mix, seed
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет временную базу данными заданного объёма и прогоняет '
+        'смесь запросов через WSGI-приложение.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=20)
+        parser.add_argument('--categories', type=int, default=5)
+        parser.add_argument('--locations', type=int, default=5)
+        parser.add_argument('--posts', type=int, default=200)
+        parser.add_argument('--comments', type=int, default=1000)
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=500,
+            help='Сколько запросов отправить.',
+        )
+        parser.add_argument(
+            '--warmup',
+            type=int,
+            default=50,
+            help='Запросы до начала замеров: прогрев кэшей.',
+        )
+        parser.add_argument(
+            '--mix',
+            default=settings.BASE_DIR / 'benchmarks' / 'request_mix.jsonl',
+            help='Файл смеси запросов в формате JSON lines.',
+        )
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--output',
+            help='Куда сохранить результаты в JSON.',
+        )
+        parser.add_argument(
+            '--baseline',
+            help='Сохранённый ранее прогон для сравнения.',
+        )
+
+    def handle(self, *args, **options):
+        from blogicum.wsgi import application
+
+        rng = random.Random(options['seed'])
+        mix = load_mix(options['mix'])
+
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0)
+        try:
+            cache.clear()
+            authors = seed(
+                options['users'], options['categories'],
+                options['locations'], options['posts'],
+                options['comments'], rng,
+            )
+            replayer = Replayer(application, authors[0], rng)
+            replayer.run(mix, options['warmup'])
+            results = replayer.run(mix, options['requests'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        self.report(results)
+        if options['output']:
+            Path(options['output']).write_text(
+                json.dumps(results, ensure_ascii=False, indent=2)
+            )
+        if options['baseline']:
+            baseline = json.loads(Path(options['baseline']).read_text())
+            self.stdout.write('\nСравнение с базовым прогоном:')
+            for name, row in compare(results, baseline).items():
+                p95_change = row['p95_change_pct']
+                if p95_change is not None:
+                    p95_change = f'{p95_change:+}%'
+                self.stdout.write(
+                    f'{name:40} p95 {p95_change} '
+                    f'запросов {row["queries_change"]:+}'
+                )
+
+    def report(self, results):
+        self.stdout.write(
+            f'{"URL":40} {"n":>5} {"p50 мс":>8} {"p95 мс":>8} '
+            f'{"p99 мс":>8} {"SQL":>6}'
+        )
+        for name, row in results.items():
+            self.stdout.write(
+                f'{name:40} {row["requests"]:>5} {row["p50_ms"]:>8} '
+                f'{row["p95_ms"]:>8} {row["p99_ms"]:>8} {row["queries"]:>6}'
+            )
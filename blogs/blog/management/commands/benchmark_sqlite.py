@@ -0,0 +1,48 @@
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from blog.benchmark import sqlite_concurrency
+
+# Режим SQLite по умолчанию, без настроек из SQLITE_PRAGMAS
+DEFAULT_PRAGMAS = {'journal_mode': 'DELETE', 'synchronous': 'FULL'}
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает параллельные чтения и записи в SQLite в режиме '
+        'по умолчанию и с прагмами из SQLITE_PRAGMAS.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--readers', type=int, default=4)
+        parser.add_argument('--writers', type=int, default=2)
+        parser.add_argument(
+            '--duration',
+            type=float,
+            default=3.0,
+            help='Длительность каждого прогона в секундах.',
+        )
+
+    def handle(self, *args, readers, writers, duration, **options):
+        profiles = {
+            'по умолчанию': DEFAULT_PRAGMAS,
+            'SQLITE_PRAGMAS': settings.SQLITE_PRAGMAS,
+        }
+        self.stdout.write(
+            f'{"Режим":16} {"чтений/с":>10} {"записей/с":>10} '
+            f'{"p95 записи мс":>14} {"ошибок":>7}'
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            for index, (name, pragmas) in enumerate(profiles.items()):
+                row = sqlite_concurrency(
+                    str(Path(directory) / f'bench{index}.sqlite3'),
+                    pragmas, readers, writers, duration,
+                )
+                self.stdout.write(
+                    f'{name:16} {row["reads_per_s"]:>10} '
+                    f'{row["writes_per_s"]:>10} '
+                    f'{str(row["write_p95_ms"]):>14} {row["errors"]:>7}'
+                )
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+
+from blog.dump import is_jsonl, iter_dump, open_dump
+
+
+class Command(BaseCommand):
+    help = (
+        'Выгружает пользователей, категории, местоположения, публикации '
+        'и комментарии в дамп (JSON или JSON lines, .gz сжимается).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path', nargs='?', help='Файл дампа; по умолчанию stdout.'
+        )
+        parser.add_argument(
+            '--format',
+            choices=('json', 'jsonl'),
+            help='Формат дампа, если его не видно по расширению файла.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=2000,
+            help='Количество записей, читаемых из базы за один запрос.',
+        )
+
+    def handle(self, *args, path, format, batch_size, **options):
+        jsonl = is_jsonl(path or '', format)
+        chunks = iter_dump(jsonl, batch_size)
+        if path is None:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
+            return
+        with open_dump(path, 'w') as file:
+            file.writelines(chunks)
+        self.stdout.write(self.style.SUCCESS(f'Дамп записан в {path}.'))
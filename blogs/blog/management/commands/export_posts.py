@@ -0,0 +1,69 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from blog.export import FORMATS, export_queryset, iter_export
+
+
+def date_argument(value):
+    date = parse_date(value)
+    if date is None:
+        raise ValueError(value)
+    return date
+
+
+class Command(BaseCommand):
+    help = (
+        'Выгружает публикации с комментариями в CSV или JSON lines '
+        'потоково, без загрузки всех записей в память.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--format',
+            choices=FORMATS,
+            default='csv',
+            help='Формат выгрузки.',
+        )
+        parser.add_argument(
+            '--from',
+            dest='date_from',
+            type=date_argument,
+            help='Публикации не раньше даты ГГГГ-ММ-ДД.',
+        )
+        parser.add_argument(
+            '--to',
+            dest='date_to',
+            type=date_argument,
+            help='Публикации не позже даты ГГГГ-ММ-ДД.',
+        )
+        parser.add_argument('--category', help='Slug категории.')
+        parser.add_argument('--author', help='Имя пользователя автора.')
+        parser.add_argument(
+            '--output',
+            help='Файл для выгрузки; по умолчанию stdout.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.BLOG_EXPORT_CHUNK_SIZE,
+            help='Количество публикаций, читаемых из базы за один запрос.',
+        )
+
+    def handle(self, *args, format, date_from, date_to, category, author,
+               output, batch_size, **options):
+        if date_from and date_to and date_from > date_to:
+            raise CommandError('Начальная дата позже конечной.')
+        lines = iter_export(
+            export_queryset(date_from, date_to, category, author),
+            format, batch_size,
+        )
+        if output is None:
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+        with open(output, 'w', encoding='utf-8', newline='') as file:
+            file.writelines(lines)
+        self.stdout.write(
+            self.style.SUCCESS(f'Выгрузка записана в {output}.')
+        )
@@ -0,0 +1,217 @@
+import random
+from datetime import timedelta
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from blog.models import Category, Comment, Location, Post, User
+from blog.search import is_supported
+from blog.utils import make_excerpt, search_key
+
+WORDS = (
+    'утро день вечер город море лес дорога дом окно книга кофе чай друг '
+    'работа отпуск поезд солнце дождь снег ветер музыка кино парк река '
+    'гора история новость наблюдение здоровье спорт прогулка кошка собака '
+    'сад огород рынок магазин школа учёба праздник подарок письмо звонок'
+).split()
+
+
+def skewed_index(rng, size, skew):
+    """Индекс от 0 до size-1 с тяжёлым хвостом.
+
+    При skew > 1 малые индексы выпадают заметно чаще больших.
+    """
+    return min(size - 1, int(size * rng.random() ** skew))
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    batch = list(islice(iterator, size))
+    while batch:
+        yield batch
+        batch = list(islice(iterator, size))
+
+
+class Command(BaseCommand):
+    help = (
+        'Генерирует детерминированные данные блога большого объёма '
+        'пакетной вставкой.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--categories', type=int, default=20)
+        parser.add_argument('--locations', type=int, default=100)
+        parser.add_argument('--posts', type=int, default=100_000)
+        parser.add_argument('--comments', type=int, default=1_000_000)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Одинаковое зерно даёт одинаковые данные.',
+        )
+        parser.add_argument(
+            '--author-skew',
+            type=float,
+            default=3.0,
+            help='Неравномерность числа публикаций у авторов, 1 — поровну.',
+        )
+        parser.add_argument(
+            '--comment-skew',
+            type=float,
+            default=4.0,
+            help='Неравномерность числа комментариев у публикаций.',
+        )
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=365 * 3,
+            help='За сколько дней в прошлом распределены публикации.',
+        )
+        parser.add_argument(
+            '--future-share',
+            type=float,
+            default=0.02,
+            help='Доля отложенных публикаций с датой в будущем.',
+        )
+        parser.add_argument(
+            '--unpublished-share',
+            type=float,
+            default=0.05,
+            help='Доля снятых с публикации постов, категорий и мест.',
+        )
+
+    def handle(self, *args, **options):
+        self.options = options
+        self.rng = random.Random(options['seed'])
+        self.now = timezone.now()
+
+        self.user_ids = self.parent_ids(
+            User, self.insert(User, options['users'], self.make_user)
+        )
+        if options['posts'] and not self.user_ids:
+            raise CommandError('Нет пользователей для авторов публикаций.')
+        self.category_ids = self.parent_ids(Category, self.insert(
+            Category, options['categories'], self.make_category
+        ))
+        self.location_ids = self.parent_ids(Location, self.insert(
+            Location, options['locations'], self.make_location
+        ))
+        self.post_ids = self.parent_ids(
+            Post, self.insert(Post, options['posts'], self.make_post)
+        )
+        if options['comments'] and not (self.post_ids and self.user_ids):
+            raise CommandError(
+                'Нет публикаций или пользователей для комментариев.'
+            )
+        self.insert(Comment, options['comments'], self.make_comment)
+
+        call_command('recount_comments', stdout=self.stdout)
+        if is_supported():
+            call_command('rebuild_search_index', stdout=self.stdout)
+
+    def insert(self, model, count, factory):
+        """Вставляет `count` строк пакетами; возвращает диапазон их id."""
+        first_id = (model.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
+        ids = range(first_id, first_id + count)
+        rows = (factory(pk) for pk in ids)
+        for number, batch in enumerate(
+            batched(rows, self.options['batch_size']), 1
+        ):
+            with transaction.atomic():
+                model.objects.bulk_create(batch)
+            self.stdout.write(
+                f'{model._meta.verbose_name_plural}: '
+                f'{min(number * self.options["batch_size"], count)}/{count}',
+                ending='\r',
+            )
+        self.stdout.write('')
+        return ids
+
+    def parent_ids(self, model, created):
+        """id, созданные в этом запуске, иначе уже существующие."""
+        if created:
+            return created
+        return list(
+            model.objects.order_by('pk').values_list('pk', flat=True)
+        )
+
+    def is_published(self):
+        return self.rng.random() >= self.options['unpublished_share']
+
+    def words(self, low, high):
+        return ' '.join(self.rng.choices(WORDS, k=self.rng.randint(low, high)))
+
+    def make_user(self, pk):
+        return User(
+            pk=pk,
+            username=f'user{pk}',
+            email=f'user{pk}@example.com',
+            password=make_password(None),
+        )
+
+    def make_category(self, pk):
+        title = self.words(1, 3).capitalize()
+        return Category(
+            pk=pk,
+            title=title,
+            search_title=search_key(title),
+            description=self.words(10, 30),
+            slug=f'category-{pk}',
+            is_published=self.is_published(),
+        )
+
+    def make_location(self, pk):
+        name = self.words(1, 2).capitalize()
+        return Location(
+            pk=pk,
+            name=name,
+            search_name=search_key(name),
+            is_published=self.is_published(),
+        )
+
+    def make_post(self, pk):
+        if self.rng.random() < self.options['future_share']:
+            pub_date = self.now + timedelta(
+                minutes=self.rng.randrange(1, 60 * 24 * 30)
+            )
+        else:
+            pub_date = self.now - timedelta(
+                minutes=self.rng.randrange(60 * 24 * self.options['days'])
+            )
+        text = self.words(20, 300)
+        return Post(
+            pk=pk,
+            title=self.words(2, 8).capitalize(),
+            text=text,
+            excerpt=make_excerpt(text),
+            pub_date=pub_date,
+            author_id=self.user_ids[skewed_index(
+                self.rng, len(self.user_ids), self.options['author_skew']
+            )],
+            category_id=(
+                self.rng.choice(self.category_ids)
+                if self.category_ids else None
+            ),
+            location_id=(
+                self.rng.choice(self.location_ids)
+                if self.location_ids and self.rng.random() < 0.7 else None
+            ),
+            is_published=self.is_published(),
+        )
+
+    def make_comment(self, pk):
+        return Comment(
+            pk=pk,
+            text=self.words(3, 60),
+            post_id=self.post_ids[skewed_index(
+                self.rng, len(self.post_ids), self.options['comment_skew']
+            )],
+            author_id=self.rng.choice(self.user_ids),
+        )
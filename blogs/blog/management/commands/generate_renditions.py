@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from blog.images import generate_renditions, has_renditions
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Создаёт уменьшенные копии изображений публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Пересоздать копии, даже если они уже есть.',
+        )
+
+    def handle(self, *args, force, **options):
+        posts = Post.objects.exclude(image='').only(
+            'pk', 'image', 'image_size'
+        ).order_by('pk')
+
+        processed = 0
+        for post in posts.iterator():
+            if not force and post.image_size and has_renditions(
+                post.image.name
+            ):
+                continue
+            Post.objects.filter(pk=post.pk).update(
+                image_size=generate_renditions(post.image.name)
+            )
+            processed += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Обработано изображений: {processed}.'
+        ))
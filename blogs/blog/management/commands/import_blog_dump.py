@@ -0,0 +1,55 @@
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.base import DeserializationError
+
+from blog.dump import import_dump
+from blog.search import is_supported
+
+
+class Command(BaseCommand):
+    help = (
+        'Загружает дамп блога (JSON, JSON lines, в том числе .gz) '
+        'потоково и пакетами.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Путь к файлу дампа.')
+        parser.add_argument(
+            '--format',
+            choices=('json', 'jsonl'),
+            help='Формат дампа, если его не видно по расширению файла.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Количество записей, вставляемых за одну транзакцию.',
+        )
+        parser.add_argument(
+            '--ignore-conflicts',
+            action='store_true',
+            help='Пропускать записи, которые уже есть в базе.',
+        )
+
+    def handle(self, *args, path, format, batch_size, ignore_conflicts,
+               **options):
+        try:
+            counts, skipped = import_dump(
+                path, format, batch_size, ignore_conflicts
+            )
+        except (OSError, ValueError, DeserializationError) as error:
+            raise CommandError(f'Не удалось загрузить дамп: {error}')
+
+        # bulk_create не вызывает сигналы: счётчики и поисковый индекс
+        # обновляем отдельно
+        call_command(
+            'recount_comments', batch_size=batch_size, stdout=self.stdout
+        )
+        if is_supported():
+            call_command('rebuild_search_index', stdout=self.stdout)
+        for label, count in counts.items():
+            self.stdout.write(f'{label}: {count}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено записей: {sum(counts.values())}, '
+            f'пропущено записей других моделей: {skipped}.'
+        ))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.search import is_supported, rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Пересобирает полнотекстовый индекс публикаций (SQLite FTS5).'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database',
+            default='default',
+            help='Псевдоним базы данных.',
+        )
+
+    def handle(self, *args, database, **options):
+        if not is_supported(database):
+            raise CommandError('Полнотекстовый индекс есть только в SQLite.')
+        count = rebuild_index(database)
+        self.stdout.write(self.style.SUCCESS(
+            f'Публикаций в поисковом индексе: {count}.'
+        ))
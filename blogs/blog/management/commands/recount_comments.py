@@ -0,0 +1,61 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from blog.cache import invalidate, post_scopes
+from blog.models import Comment, Post
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает и исправляет счётчики комментариев публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Количество публикаций, обновляемых за один запрос.',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Только показать число расхождений, ничего не меняя.',
+        )
+
+    def handle(self, *args, batch_size, dry_run, **options):
+        drifted = Post.objects.order_by('pk').annotate(
+            actual_count=Count('comments')
+        ).exclude(
+            comment_count=F('actual_count')
+        ).values_list('pk', flat=True)
+
+        fixed = 0
+        batch = []
+        for pk in drifted.iterator(chunk_size=batch_size):
+            batch.append(pk)
+            if len(batch) >= batch_size:
+                fixed += self.save_batch(batch, dry_run)
+                batch = []
+        fixed += self.save_batch(batch, dry_run)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Расхождений найдено: {fixed}'
+            + (' (без изменений)' if dry_run else ', исправлено.')
+        ))
+
+    def save_batch(self, batch, dry_run):
+        if not batch or dry_run:
+            return len(batch)
+        comments = Comment.objects.filter(
+            post=OuterRef('pk')
+        ).order_by().values('post').annotate(
+            total=Count('pk')
+        ).values('total')
+        posts = Post.objects.filter(pk__in=batch)
+        # Счётчик считается в самом UPDATE: комментарий, добавленный
+        # после поиска расхождений, не потеряется
+        with transaction.atomic():
+            posts.update(comment_count=Coalesce(Subquery(comments), 0))
+        invalidate(post_scopes(posts))
+        return len(batch)
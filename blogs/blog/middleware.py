@@ -0,0 +1,110 @@
+import logging
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from .routers import PIN_COOKIE
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStats:
+    """Количество, время и повторы SQL-запросов одного HTTP-запроса."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.statements[sql] += 1
+
+    @property
+    def duplicates(self):
+        return {
+            sql: count for sql, count in self.statements.items() if count > 1
+        }
+
+
+def get_query_budget(view_name):
+    budgets = getattr(settings, 'QUERY_BUDGETS', {})
+    return {
+        **budgets.get('default', {}),
+        **budgets.get(view_name, {}),
+    }
+
+
+class QueryInstrumentationMiddleware:
+    """Считает SQL-запросы каждого HTTP-запроса.
+
+    Статистика доступна как `request.query_stats` и `response.query_stats`,
+    уходит в заголовок Server-Timing и в лог, если представление
+    превысило бюджет из настройки `QUERY_BUDGETS`.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        stats = request.query_stats = QueryStats()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(stats))
+            response = self.get_response(request)
+        total = time.perf_counter() - start
+
+        response.query_stats = stats
+        if getattr(settings, 'SERVER_TIMING_HEADER', False):
+            response['Server-Timing'] = (
+                f'db;dur={stats.duration * 1000:.1f};'
+                f'desc="{stats.count} queries", '
+                f'total;dur={total * 1000:.1f}'
+            )
+        self.check_budget(request, stats, total)
+        return response
+
+    def check_budget(self, request, stats, total):
+        match = request.resolver_match
+        view_name = match.view_name if match else None
+        budget = get_query_budget(view_name)
+        over_queries = stats.count > budget.get('queries', float('inf'))
+        over_time = total * 1000 > budget.get('duration_ms', float('inf'))
+        if over_queries or over_time:
+            logger.warning(
+                '%s %s (%s): %d запросов за %.1f мс из %.1f мс, '
+                'повторы: %s',
+                request.method, request.path, view_name, stats.count,
+                stats.duration * 1000, total * 1000,
+                stats.duplicates or 'нет',
+            )
+
+
+class PrimaryPinMiddleware:
+    """После запроса с записью читать из основной базы.
+
+    Cookie живёт `DATABASE_PIN_SECONDS` секунд — с запасом на отставание
+    реплик.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        pin_seconds = getattr(settings, 'DATABASE_PIN_SECONDS', 0)
+        if request.method not in ('GET', 'HEAD', 'OPTIONS') and pin_seconds:
+            response.set_cookie(
+                PIN_COOKIE, '1', max_age=pin_seconds,
+                httponly=True, samesite='Lax',
+            )
+        return response
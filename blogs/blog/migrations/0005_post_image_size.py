@@ -0,0 +1,18 @@
+# Generated by Django 3.2.16 on 2026-10-17 04:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0004_post_excerpt'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='image_size',
+            field=models.CharField(blank=True, editable=False, help_text='Ширина и высота изображения в пикселях: 1600x900.', max_length=32, verbose_name='Размер изображения'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 3.2.16 on 2026-10-17 04:39
+
+from django.db import migrations
+
+from blog.search import CREATE_SQL, DROP_SQL, is_supported, rebuild_index
+
+
+def create_search_index(apps, schema_editor):
+    if not is_supported(schema_editor.connection.alias):
+        return
+    schema_editor.execute(CREATE_SQL)
+    rebuild_index(schema_editor.connection.alias)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(DROP_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0005_post_image_size'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 3.2.16 on 2026-10-17 05:25
+
+from django.db import migrations, models
+
+from blog.utils import search_key
+
+
+def fill_search_keys(apps, schema_editor):
+    for model_name, field in (('Category', 'title'), ('Location', 'name')):
+        model = apps.get_model('blog', model_name)
+        batch = []
+        for obj in model.objects.only('pk', field).iterator(chunk_size=1000):
+            setattr(obj, f'search_{field}', search_key(getattr(obj, field)))
+            batch.append(obj)
+            if len(batch) >= 1000:
+                model.objects.bulk_update(batch, [f'search_{field}'])
+                batch = []
+        model.objects.bulk_update(batch, [f'search_{field}'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0007_autocomplete_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='category',
+            name='category_published_title_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='location',
+            name='location_published_name_idx',
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='search_title',
+            field=models.CharField(default='', editable=False, max_length=256, verbose_name='Заголовок для поиска'),
+        ),
+        migrations.AddField(
+            model_name='location',
+            name='search_name',
+            field=models.CharField(default='', editable=False, max_length=256, verbose_name='Название для поиска'),
+        ),
+        migrations.RunPython(fill_search_keys, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['search_title'], name='category_published_search_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='location',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['search_name'], name='location_published_search_idx'),
+        ),
+    ]
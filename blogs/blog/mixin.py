@@ -1,9 +1,45 @@
+import hashlib
+import math
+from functools import wraps
+from http import HTTPStatus
+
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.cache import cache
+from django.db.models import Max, Min, Q
+from django.http import Http404
 from django.shortcuts import redirect
 from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils import timezone
+from django.utils.http import http_date, quote_etag
 from django.views.generic import View
 
+from .cache import (
+    get_last_published_key,
+    get_page_cache_key,
+    get_versions,
+    version_time,
+)
 from .models import Comment, Post
+from .paginator import CursorPaginator, InvalidCursor
+from .routers import is_pinned, read_from_replica
+
+
+def cached_lookup(method):
+    """Запоминает результат метода представления на время запроса.
+
+    Экземпляр представления создаётся на каждый запрос, поэтому
+    объекты, найденные по параметрам URL, достаточно хранить в нём.
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        lookups = self.__dict__.setdefault('_cached_lookups', {})
+        key = (method.__name__, args, tuple(sorted(kwargs.items())))
+        if key not in lookups:
+            lookups[key] = method(self, *args, **kwargs)
+        return lookups[key]
+    return wrapper
 
 
 class CommentMixinView(LoginRequiredMixin, View):
@@ -11,8 +47,12 @@ class CommentMixinView(LoginRequiredMixin, View):
     template_name = 'blog/comment.html'
     pk_url_kwarg = 'comment_id'
 
+    @cached_lookup
+    def get_object(self, queryset=None):
+        return super().get_object(queryset)
+
     def dispatch(self, request, *args, **kwargs):
-        if self.get_object().author != request.user:
+        if self.get_object().author_id != request.user.id:
             return redirect(
                 'blog:post_detail',
                 post_id=self.kwargs[self.pk_url_kwarg]
@@ -33,10 +73,224 @@ class PostMixinView(LoginRequiredMixin, View):
     template_name = 'blog/create.html'
     pk_url_kwarg = 'post_id'
 
+    @cached_lookup
+    def get_object(self, queryset=None):
+        return super().get_object(queryset)
+
     def dispatch(self, request, *args, **kwargs):
-        if self.get_object().author != self.request.user:
+        if self.get_object().author_id != self.request.user.id:
             return redirect(
                 'blog:post_detail',
                 post_id=self.kwargs[self.pk_url_kwarg]
             )
         return super().dispatch(request, *args, **kwargs)
+
+
+class CursorPaginationMixin:
+    """Курсорная пагинация списка при включённой `BLOG_CURSOR_PAGINATION`."""
+
+    def get_cursor_pagination(self):
+        return getattr(settings, 'BLOG_CURSOR_PAGINATION', False)
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self.get_cursor_pagination():
+            return super().paginate_queryset(queryset, page_size)
+        paginator = CursorPaginator(queryset, page_size)
+        try:
+            page = paginator.page(
+                after=self.request.GET.get('after'),
+                before=self.request.GET.get('before'),
+            )
+        except InvalidCursor as e:
+            raise Http404(str(e))
+        return paginator, page, page.object_list, page.has_other_pages()
+
+
+class PageScopesMixin:
+    """Области кэша страницы: шаблоны `page_cache_scopes` с kwargs URL.
+
+    Версии областей сбрасываются сигналами при изменении публикаций,
+    комментариев, категорий и мест.
+    """
+
+    page_cache_scopes = ()
+
+    def get_page_cache_scopes(self):
+        return [
+            scope.format(**self.kwargs) for scope in self.page_cache_scopes
+        ]
+
+    def get_page_cache_extra(self):
+        """Дополнительные части ключа кэша страницы."""
+        return ()
+
+
+class AnonymousPageCacheMixin(PageScopesMixin):
+    """Кэширует страницу целиком для анонимных читателей.
+
+    Ключ строится из адреса страницы (с номером страницы) и версий
+    областей `page_cache_scopes`.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        timeout = getattr(settings, 'BLOG_PAGE_CACHE_TIMEOUT', None)
+        if (
+            not timeout
+            or request.method != 'GET'
+            or request.user.is_authenticated
+        ):
+            return super().dispatch(request, *args, **kwargs)
+
+        key = get_page_cache_key(
+            request,
+            self.get_page_cache_scopes(),
+            *self.get_page_cache_extra(),
+        )
+        response = cache.get(key)
+        if response is None:
+            response = super().dispatch(request, *args, **kwargs)
+            if response.status_code == HTTPStatus.OK:
+                if callable(getattr(response, 'render', None)):
+                    response.add_post_render_callback(
+                        lambda rendered: cache.set(key, rendered, timeout)
+                    )
+                else:
+                    cache.set(key, response, timeout)
+        return response
+
+
+class ConditionalGetMixin(PageScopesMixin):
+    """Отвечает 304 Not Modified, не выполняя основной запрос страницы.
+
+    Валидаторы строятся из версий областей `page_cache_scopes` (их меняют
+    сигналы при любых правках) и даты последней видимой публикации
+    из `get_published_filter()`: отложенные посты появляются без
+    сигналов. Эта дата кэшируется до выхода ближайшей отложенной
+    публикации, но не дольше `BLOG_PAGE_CACHE_TIMEOUT`, и входит в ключ
+    кэша страницы.
+
+    Страницы вошедших пользователей содержат CSRF-токен и имя
+    пользователя, поэтому 304 отдаётся только анонимным читателям,
+    если `anonymous_only` не сброшен.
+    """
+
+    anonymous_only = True
+
+    def get_published_filter(self):
+        """Q-фильтр публикаций страницы; None — страница без ленты."""
+        return None
+
+    def get_publication_dates(self):
+        """Даты последней видимой и ближайшей отложенной публикаций."""
+        now = timezone.now()
+        # Один запрос по частичному индексу даты публикации
+        return Post.objects.filter(
+            self.get_published_filter(),
+            is_published=True,
+            category__is_published=True,
+        ).aggregate(
+            last=Max('pub_date', filter=Q(pub_date__lte=now)),
+            next=Min('pub_date', filter=Q(pub_date__gt=now)),
+        )
+
+    @cached_lookup
+    def get_cached_last_published(self):
+        if self.get_published_filter() is None:
+            return None
+        timeout = getattr(settings, 'BLOG_PAGE_CACHE_TIMEOUT', None)
+        if not timeout:
+            return self.get_publication_dates()['last']
+        scopes = self.get_page_cache_scopes()
+        key = get_last_published_key(scopes, get_versions(scopes))
+        last_published = cache.get(key)
+        if last_published is None:
+            dates = self.get_publication_dates()
+            last_published = dates['last'] or ''
+            if dates['next'] is not None:
+                # Запись устаревает, когда выходит отложенная публикация
+                timeout = min(timeout, max(1, math.ceil(
+                    (dates['next'] - timezone.now()).total_seconds()
+                )))
+            cache.set(key, last_published, timeout)
+        return last_published or None
+
+    def get_page_cache_extra(self):
+        last_published = self.get_cached_last_published()
+        return (
+            *super().get_page_cache_extra(),
+            last_published.isoformat() if last_published else '',
+        )
+
+    def get_validators(self):
+        versions = get_versions(self.get_page_cache_scopes())
+        last_published = self.get_cached_last_published()
+        times = [version_time(version) for version in versions]
+        if last_published is not None:
+            times.append(last_published.timestamp())
+        raw = '|'.join([
+            self.request.get_full_path(),
+            str(self.request.user.pk),
+            *versions,
+            last_published.isoformat() if last_published else '',
+        ])
+        etag = 'W/' + quote_etag(hashlib.md5(raw.encode()).hexdigest())
+        if None in times or not times:
+            return etag, None
+        return etag, int(max(times))
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD') or (
+            self.anonymous_only and request.user.is_authenticated
+        ):
+            return super().dispatch(request, *args, **kwargs)
+        etag, last_modified = self.get_validators()
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is not None:
+            return response
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code == HTTPStatus.OK:
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+        return response
+
+
+class PostCardCacheMixin:
+    """Версии карточек публикаций для фрагментного кэша post_card.html.
+
+    Версия карточки — версия области `post:<id>`, которую сигналы
+    меняют при правке публикации, её категории, места и комментариев.
+    """
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        posts = list(context.get('page_obj') or context['object_list'])
+        versions = get_versions([f'post:{post.pk}' for post in posts])
+        for post, version in zip(posts, versions):
+            post.card_version = version
+        context['post_card_timeout'] = getattr(
+            settings, 'BLOG_POST_CARD_CACHE_TIMEOUT', 0
+        )
+        return context
+
+
+class ReplicaReadMixin:
+    """Отдаёт GET-запросы из реплики, если браузер недавно не писал.
+
+    Шаблон рендерится здесь же: ленивые запросы страницы выполняются
+    при рендеринге и тоже должны уйти в реплику.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD') or is_pinned(request):
+            return super().dispatch(request, *args, **kwargs)
+        # Пользователь запроса загружается из основной базы заранее,
+        # иначе после входа его ещё не было бы в реплике
+        request.user.is_authenticated
+        with read_from_replica():
+            response = super().dispatch(request, *args, **kwargs)
+            if callable(getattr(response, 'render', None)):
+                response.render()
+        return response
@@ -1,6 +1,8 @@
 from django.contrib.auth import get_user_model
 from django.db import models
 
+from .utils import make_excerpt, post_deletion, search_key
+
 User = get_user_model()
 
 
@@ -24,6 +26,12 @@ class Category(PublishedCreated):
         max_length=256,
         verbose_name='Заголовок'
     )
+    search_title = models.CharField(
+        max_length=256,
+        default='',
+        editable=False,
+        verbose_name='Заголовок для поиска'
+    )
     description = models.TextField(
         verbose_name='Описание'
     )
@@ -39,24 +47,65 @@ class Category(PublishedCreated):
     class Meta:
         verbose_name = 'Категория'
         verbose_name_plural = 'Категории'
+        indexes = (
+            models.Index(
+                fields=('search_title',),
+                condition=models.Q(is_published=True),
+                name='category_published_search_idx',
+            ),
+        )
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        self.search_title = search_key(self.title)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'title' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'search_title'}
+        super().save(*args, **kwargs)
+
 
 class Location(PublishedCreated):
     name = models.CharField(
         max_length=256,
         verbose_name='Название места'
     )
+    search_name = models.CharField(
+        max_length=256,
+        default='',
+        editable=False,
+        verbose_name='Название для поиска'
+    )
 
     class Meta:
         verbose_name = 'Местоположение'
         verbose_name_plural = 'Местоположения'
+        indexes = (
+            models.Index(
+                fields=('search_name',),
+                condition=models.Q(is_published=True),
+                name='location_published_search_idx',
+            ),
+        )
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        self.search_name = search_key(self.name)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'name' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'search_name'}
+        super().save(*args, **kwargs)
+
+
+class PostQuerySet(models.QuerySet):
+
+    def delete(self):
+        with post_deletion():
+            return super().delete()
+
 
 class Post(PublishedCreated):
     title = models.CharField(
@@ -66,6 +115,11 @@ class Post(PublishedCreated):
     text = models.TextField(
         verbose_name='Текст'
     )
+    excerpt = models.TextField(
+        blank=True,
+        editable=False,
+        verbose_name='Начало текста'
+    )
     pub_date = models.DateTimeField(
         help_text='Если установить дату и '
         'время в будущем — можно делать отложенные публикации.',
@@ -95,16 +149,63 @@ class Post(PublishedCreated):
         blank=True,
         verbose_name='Изображение'
     )
+    image_size = models.CharField(
+        max_length=32,
+        blank=True,
+        editable=False,
+        help_text='Ширина и высота изображения в пикселях: 1600x900.',
+        verbose_name='Размер изображения'
+    )
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество комментариев'
+    )
 
     class Meta:
         default_related_name = 'posts'
         verbose_name = 'Публикация'
         verbose_name_plural = 'Публикации'
         ordering = ('-pub_date',)
+        indexes = (
+            models.Index(
+                fields=('pub_date',),
+                condition=models.Q(is_published=True),
+                name='post_published_pub_date_idx',
+            ),
+            models.Index(
+                fields=('category', 'pub_date'),
+                condition=models.Q(is_published=True),
+                name='post_category_pub_date_idx',
+            ),
+            models.Index(
+                fields=('author', 'pub_date'),
+                name='post_author_pub_date_idx',
+            ),
+        )
+
+    objects = PostQuerySet.as_manager()
 
     def __str__(self):
         return self.title
 
+    def delete(self, *args, **kwargs):
+        with post_deletion():
+            return super().delete(*args, **kwargs)
+
+    @property
+    def image_dimensions(self):
+        if self.image_size:
+            width, height = self.image_size.split('x')
+            return int(width), int(height)
+
+    def save(self, *args, **kwargs):
+        self.excerpt = make_excerpt(self.text)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'text' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'excerpt'}
+        super().save(*args, **kwargs)
+
 
 class Comment(models.Model):
     text = models.TextField(
@@ -130,6 +231,12 @@ class Comment(models.Model):
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
         ordering = ('created_at',)
+        indexes = (
+            models.Index(
+                fields=('post', 'created_at'),
+                name='comment_post_created_at_idx',
+            ),
+        )
 
     def __str__(self) -> str:
         return f'Комментарий пользователя {self.author}'
@@ -0,0 +1,173 @@
+import base64
+import binascii
+import hashlib
+import time
+from datetime import datetime
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import InvalidPage, Paginator
+from django.db.models import Max, Q
+from django.utils.functional import cached_property
+
+from tasks.utils import background
+
+COUNT_KEY = 'blog:admin_count:{}'
+TABLE_COUNT_KEY = 'blog:admin_table_count:{}'
+
+
+class InvalidCursor(InvalidPage):
+    pass
+
+
+def encode_cursor(post):
+    raw = f'{post.pub_date.isoformat()}|{post.pk}'
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(
+            cursor + '=' * (-len(cursor) % 4)
+        ).decode()
+        pub_date, pk = raw.rsplit('|', 1)
+        return datetime.fromisoformat(pub_date), int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursor('Некорректный курсор страницы.')
+
+
+class CursorPage:
+    """Страница курсорной пагинации по ключу (pub_date, id)."""
+
+    is_cursor = True
+
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self):
+        if self._has_next:
+            return encode_cursor(self.object_list[-1])
+
+    @property
+    def previous_cursor(self):
+        if self._has_previous:
+            return encode_cursor(self.object_list[0])
+
+
+class CursorPaginator:
+    """Пагинация без OFFSET и COUNT(*) для лент публикаций.
+
+    Публикации упорядочены по (-pub_date, -id), а страница задаётся
+    непрозрачным курсором последней (after) или первой (before)
+    публикации соседней страницы.
+    """
+
+    def __init__(self, queryset, per_page):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+
+    def page(self, after=None, before=None):
+        if after:
+            pub_date, pk = decode_cursor(after)
+            queryset = self.queryset.filter(
+                Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, pk__lt=pk)
+            ).order_by('-pub_date', '-pk')
+        elif before:
+            pub_date, pk = decode_cursor(before)
+            queryset = self.queryset.filter(
+                Q(pub_date__gt=pub_date) | Q(pub_date=pub_date, pk__gt=pk)
+            ).order_by('pub_date', 'pk')
+        else:
+            queryset = self.queryset.order_by('-pub_date', '-pk')
+
+        object_list = list(queryset[:self.per_page + 1])
+        has_more = len(object_list) > self.per_page
+        object_list = object_list[:self.per_page]
+        if before:
+            object_list.reverse()
+            return CursorPage(object_list, self, True, has_more)
+        return CursorPage(object_list, self, has_more, bool(after))
+
+
+@background
+def cache_table_count(label):
+    """Точное число строк таблицы для списков админки без фильтров."""
+    cache.set(
+        TABLE_COUNT_KEY.format(label),
+        (apps.get_model(label)._default_manager.count(), time.time()),
+        None,
+    )
+
+
+class EstimatedCountPaginator(Paginator):
+    """Пагинатор админки, который не считает большие таблицы целиком.
+
+    До `BLOG_ADMIN_COUNT_THRESHOLD` строк число считается точно
+    ограниченным запросом. Выше порога список без фильтров берёт
+    точное число из кэша, которое фоновая задача обновляет раз
+    в `BLOG_ADMIN_COUNT_CACHE_TIMEOUT` секунд; пока его нет, выводится
+    оценка по наибольшему id с пометкой `estimated`. Для списка
+    с фильтрами точное число кэшируется на тот же срок.
+    """
+
+    estimated = False
+
+    @cached_property
+    def count(self):
+        threshold = settings.BLOG_ADMIN_COUNT_THRESHOLD
+        queryset = self.object_list.order_by()
+        bounded = queryset[:threshold + 1].count()
+        if bounded <= threshold:
+            return bounded
+        if not queryset.query.has_filters():
+            return self.table_count(queryset, bounded)
+
+        sql, params = queryset.query.sql_with_params()
+        key = COUNT_KEY.format(
+            hashlib.md5(f'{sql}|{params}'.encode()).hexdigest()
+        )
+        count = cache.get(key)
+        if count is None:
+            count = queryset.count()
+            cache.set(key, count, settings.BLOG_ADMIN_COUNT_CACHE_TIMEOUT)
+        return count
+
+    def table_count(self, queryset, bounded):
+        label = queryset.model._meta.label
+        timeout = settings.BLOG_ADMIN_COUNT_CACHE_TIMEOUT
+        cached = cache.get(TABLE_COUNT_KEY.format(label))
+        queued_key = TABLE_COUNT_KEY.format(f'{label}:queued')
+        # Одна задача на срок, а не на каждый просмотр списка
+        if (
+            cached is None or time.time() - cached[1] > timeout
+        ) and cache.add(queued_key, 1, timeout):
+            cache_table_count.delay(label)
+        if cached is not None:
+            return cached[0]
+        self.estimated = True
+        return max(
+            bounded, queryset.aggregate(last=Max('pk'))['last'] or 0
+        )
@@ -0,0 +1,55 @@
+"""Чтение лент и страниц публикаций из реплик базы данных.
+
+Представления с `ReplicaReadMixin` читают внутри `read_from_replica()`,
+всё остальное, включая любые записи, идёт в основную базу. После
+записи `PrimaryPinMiddleware` ставит cookie, и пока она жива, запросы
+этого браузера читают из основной базы: автор сразу видит свой пост.
+"""
+import random
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+
+PIN_COOKIE = 'pin_primary'
+
+# Только что созданная сессия может ещё не дойти до реплики, и вход
+# бы «терялся»: сессии всегда читаются из основной базы
+PRIMARY_APPS = {'sessions'}
+
+_state = threading.local()
+
+
+@contextmanager
+def read_from_replica():
+    """Направляет чтения на одну случайную реплику из DATABASE_REPLICAS."""
+    replicas = getattr(settings, 'DATABASE_REPLICAS', ())
+    previous = getattr(_state, 'replica', None)
+    _state.replica = random.choice(replicas) if replicas else None
+    try:
+        yield
+    finally:
+        _state.replica = previous
+
+
+def is_pinned(request):
+    return PIN_COOKIE in request.COOKIES
+
+
+class ReplicaRouter:
+    """Роутер Django: реплики только для чтения, записи — в default."""
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label in PRIMARY_APPS:
+            return 'default'
+        return getattr(_state, 'replica', None)
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Реплики получают схему вместе с данными из основной базы
+        return db == 'default'
@@ -0,0 +1,104 @@
+"""Полнотекстовый поиск по публикациям на SQLite FTS5.
+
+Таблица `blog_post_fts` хранит заголовок и текст публикации под её id
+и обновляется сигналами; после массовой загрузки данных индекс
+пересобирается командой `manage.py rebuild_search_index`.
+"""
+import re
+from functools import lru_cache
+
+from django.db import connection, connections
+from django.db.models import F, Q
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = 'blog_post_fts'
+
+CREATE_SQL = (
+    f'CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5('
+    "title, text, tokenize = 'unicode61 remove_diacritics 2')"
+)
+DROP_SQL = f'DROP TABLE IF EXISTS {FTS_TABLE}'
+
+WORD = re.compile(r'\w+')
+
+
+@lru_cache(maxsize=None)
+def is_supported(alias='default'):
+    """SQLite, собранный с FTS5; проверяется один раз на базу."""
+    db = connections[alias]
+    if db.vendor != 'sqlite':
+        return False
+    with db.cursor() as cursor:
+        cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+        return bool(cursor.fetchone()[0])
+
+
+def post_table(db):
+    from .models import Post
+
+    return (
+        db.ops.quote_name(Post._meta.db_table),
+        db.ops.quote_name(Post._meta.pk.column),
+    )
+
+
+def build_match(query):
+    """Запрос пользователя в синтаксисе MATCH: все слова, по префиксу.
+
+    Слова берутся в кавычки, поэтому операторы FTS5 и лишние символы
+    во вводе не ломают запрос.
+    """
+    return ' '.join(f'"{word}"*' for word in WORD.findall(query.lower()))
+
+
+def index_post(post):
+    if not is_supported():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT OR REPLACE INTO {FTS_TABLE} (rowid, title, text) '
+            'VALUES (%s, %s, %s)',
+            [post.pk, post.title, post.text],
+        )
+
+
+def unindex_post(post_id):
+    if not is_supported():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [post_id])
+
+
+def rebuild_index(using='default'):
+    """Заполняет индекс заново и возвращает число публикаций в нём."""
+    table, pk = post_table(connections[using])
+    with connections[using].cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, text) '
+            f'SELECT {pk}, title, text FROM {table}'
+        )
+        return cursor.rowcount
+
+
+def search_posts(queryset, query):
+    """Публикации из `queryset`, подходящие под запрос, по релевантности."""
+    match = build_match(query)
+    if not match:
+        return queryset.none()
+    if not is_supported(queryset.db):
+        words = Q()
+        for word in WORD.findall(query):
+            words &= Q(title__icontains=word) | Q(text__icontains=word)
+        return queryset.filter(words)
+    # Совпадения отбираются одним поиском по индексу, ранг bm25
+    # читается только для найденных строк по rowid
+    table, pk = post_table(connections[queryset.db])
+    return queryset.filter(pk__in=RawSQL(
+        f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+        [match],
+    )).annotate(rank=RawSQL(
+        f'SELECT rank FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s '
+        f'AND rowid = {table}.{pk}',
+        [match],
+    )).order_by(F('rank').asc(), '-pub_date')
@@ -0,0 +1,137 @@
+from django.db.models import F
+from django.db.models.signals import (
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from .cache import invalidate, post_scopes
+from .images import has_renditions, process_post_image
+from .models import Category, Comment, Location, Post, User
+from .search import index_post, unindex_post
+from .utils import deleting_posts
+
+
+@receiver(post_save, sender=Comment)
+def increment_comment_count(sender, instance, created, **kwargs):
+    if created:
+        Post.objects.filter(pk=instance.post_id).update(
+            comment_count=F('comment_count') + 1
+        )
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comment_count(sender, instance, **kwargs):
+    if instance.post_id in deleting_posts():
+        return
+    Post.objects.filter(
+        pk=instance.post_id,
+        comment_count__gt=0,
+    ).update(
+        comment_count=F('comment_count') - 1
+    )
+
+
+@receiver(pre_save, sender=Post)
+def remember_post_scopes(sender, instance, **kwargs):
+    # Страницы прежней категории тоже нужно сбросить
+    instance._old_cache_scopes = (
+        post_scopes(Post.objects.filter(pk=instance.pk))
+        if instance.pk else set()
+    )
+
+
+@receiver(post_save, sender=Post)
+def invalidate_saved_post(sender, instance, **kwargs):
+    invalidate(
+        instance.__dict__.pop('_old_cache_scopes', set())
+        | post_scopes(Post.objects.filter(pk=instance.pk))
+    )
+
+
+@receiver(pre_delete, sender=Post)
+def invalidate_deleted_post(sender, instance, **kwargs):
+    # Каскадно удаляемые комментарии не трогают счётчик и кэш
+    # публикации: она удаляется, а её страницы сбрасываются здесь.
+    # Вне блока post_deletion() множество не сохраняется
+    deleting_posts().add(instance.pk)
+    invalidate(post_scopes(Post.objects.filter(pk=instance.pk)))
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment_post(sender, instance, **kwargs):
+    if instance.post_id in deleting_posts():
+        return
+    invalidate(post_scopes(Post.objects.filter(pk=instance.post_id)))
+
+
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+def invalidate_category(sender, instance, **kwargs):
+    invalidate(
+        {f'category:{instance.slug}', 'choices:category'}
+        | post_scopes(instance.posts.all())
+    )
+
+
+@receiver(post_save, sender=Location)
+@receiver(pre_delete, sender=Location)
+def invalidate_location(sender, instance, **kwargs):
+    invalidate({'choices:location'} | post_scopes(instance.posts.all()))
+
+
+@receiver(pre_save, sender=User)
+def remember_username(sender, instance, update_fields=None, **kwargs):
+    instance._old_username = (
+        User.objects.filter(pk=instance.pk).values_list(
+            'username', flat=True
+        ).first()
+        if instance.pk and not (
+            update_fields and 'username' not in update_fields
+        ) else None
+    )
+
+
+@receiver(post_save, sender=User)
+def invalidate_profile(sender, instance, update_fields=None, **kwargs):
+    old_username = instance.__dict__.pop('_old_username', None)
+    # Вход пользователя обновляет только last_login
+    if update_fields and set(update_fields) == {'last_login'}:
+        return
+    scopes = {f'author:{instance.username}'}
+    if old_username and old_username != instance.username:
+        # Имя автора выводится на страницах его публикаций
+        # и тех, которые он комментировал
+        scopes |= (
+            {f'author:{old_username}'}
+            | post_scopes(instance.posts.all())
+            | post_scopes(Post.objects.filter(comments__author=instance))
+        )
+    invalidate(scopes)
+
+
+@receiver(post_save, sender=Post)
+def queue_post_image(sender, instance, **kwargs):
+    if instance.image and has_renditions(instance.image.name):
+        return
+    if instance.image_size:
+        # Пока копии не готовы, выводится оригинал
+        instance.image_size = ''
+        Post.objects.filter(pk=instance.pk).update(image_size='')
+    if instance.image:
+        process_post_image.delay(instance.pk)
+
+
+@receiver(post_save, sender=Post)
+def index_saved_post(sender, instance, update_fields=None, **kwargs):
+    if update_fields and not {'title', 'text'} & set(update_fields):
+        return
+    index_post(instance)
+
+
+@receiver(post_delete, sender=Post)
+def unindex_deleted_post(sender, instance, **kwargs):
+    unindex_post(instance.pk)
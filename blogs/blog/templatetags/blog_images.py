@@ -0,0 +1,47 @@
+from django import template
+from django.core.files.storage import default_storage
+from django.utils.html import format_html
+
+from blog.images import RENDITIONS, rendition_name, rendition_size
+
+register = template.Library()
+
+
+@register.simple_tag
+def post_image(post, rendition, css_class='', sizes=None):
+    """Изображение публикации с уменьшенными копиями и ленивой загрузкой.
+
+    Пока копии не готовы, выводится оригинал.
+    """
+    if not post.image:
+        return ''
+    if not post.image_dimensions:
+        return format_html(
+            '<img class="{}" src="{}" loading="lazy" alt="">',
+            css_class, post.image.url,
+        )
+
+    width, height = rendition_size(*post.image_dimensions, rendition)
+    widths = sorted({
+        rendition_size(*post.image_dimensions, name)[0]: name
+        for name in RENDITIONS
+    }.items())
+
+    def url(name, fmt):
+        return default_storage.url(rendition_name(post.image.name, name, fmt))
+
+    def srcset(fmt):
+        return ', '.join(f'{url(name, fmt)} {size}w' for size, name in widths)
+
+    sizes = sizes or f'(max-width: {width}px) 100vw, {width}px'
+
+    return format_html(
+        '<picture>'
+        '<source type="image/webp" srcset="{}" sizes="{}">'
+        '<img class="{}" src="{}" srcset="{}" sizes="{}"'
+        ' width="{}" height="{}" loading="lazy" alt="">'
+        '</picture>',
+        srcset('webp'), sizes,
+        css_class, url(rendition, 'jpeg'), srcset('jpeg'), sizes,
+        width, height,
+    )
@@ -8,6 +8,30 @@ urlpatterns = [
     path('',
          views.HomePageListView.as_view(),
          name='index'),
+    path('feed/',
+         views.PostFeedView.as_view(),
+         name='feed'),
+    path('feed/rss/',
+         views.PostFeedView.as_view(feed_format='rss'),
+         name='feed_rss'),
+    path('category/<slug:category_slug>/feed/',
+         views.CategoryFeedView.as_view(),
+         name='category_feed'),
+    path('category/<slug:category_slug>/feed/rss/',
+         views.CategoryFeedView.as_view(feed_format='rss'),
+         name='category_feed_rss'),
+    path('profile/<slug:username>/feed/',
+         views.UserFeedView.as_view(),
+         name='profile_feed'),
+    path('profile/<slug:username>/feed/rss/',
+         views.UserFeedView.as_view(feed_format='rss'),
+         name='profile_feed_rss'),
+    path('autocomplete/<slug:kind>/',
+         views.AutocompleteView.as_view(),
+         name='autocomplete'),
+    path('search/',
+         views.PostSearchView.as_view(),
+         name='search'),
     path('posts/<int:post_id>/',
          views.PostDetailView.as_view(),
          name='post_detail'),
@@ -1,20 +1,64 @@
-from django.db.models import Count
+import threading
+from contextlib import contextmanager
+
+from django.db.models import Q
 from django.utils import timezone
+from django.utils.text import Truncator
 
+EXCERPT_WORDS = 10
 
-def filter_posts(queryset):
-    return queryset.filter(
+_deletion = threading.local()
+
+
+def make_excerpt(text):
+    return Truncator(text).words(EXCERPT_WORDS, truncate=' …')
+
+
+def search_key(text):
+    """Название без регистра: lower() в SQLite понимает только латиницу."""
+    return text.casefold()
+
+
+def published_posts():
+    return Q(
         is_published=True,
         pub_date__lte=timezone.now(),
         category__is_published=True
     )
 
 
+def filter_posts(queryset):
+    return queryset.filter(published_posts())
+
+
 def annotation_posts(queryset):
     return queryset.select_related(
         'author', 'location', 'category'
+    ).defer(
+        'text'
     ).order_by(
         '-pub_date'
-    ).annotate(
-        comment_count=Count('comments')
     )
+
+
+def deleting_posts():
+    """Публикации, удаляемые в текущем блоке `post_deletion()`."""
+    posts = getattr(_deletion, 'posts', None)
+    return set() if posts is None else posts
+
+
+@contextmanager
+def post_deletion():
+    """Блок удаления публикаций вместе с комментариями.
+
+    Публикации отмечаются в pre_delete и забываются при выходе из блока,
+    даже если удаление завершилось ошибкой.
+    """
+    if getattr(_deletion, 'posts', None) is not None:
+        yield
+        return
+    _deletion.posts = set()
+    try:
+        yield
+    finally:
+        _deletion.posts = None
@@ -1,25 +1,63 @@
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.cache import cache
+from django.db.models import Q
+from django.http import (
+    Http404,
+    HttpResponse,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.shortcuts import get_object_or_404
 from django.urls import reverse
+from django.utils.http import urlencode
 from django.views.generic import (
     CreateView,
     DeleteView,
     DetailView,
     ListView,
     UpdateView,
+    View,
 )
 
+from .autocomplete import LIMIT, SOURCES, search_choices
+from .cache import get_page_cache_key
+from .feeds import PostFeed, cache_chunks
 from .forms import CommentEditForm, PostEditForm, UserEditForm
-from .mixin import CommentMixinView, PostMixinView
+from .mixin import (
+    AnonymousPageCacheMixin,
+    CommentMixinView,
+    ConditionalGetMixin,
+    CursorPaginationMixin,
+    PostCardCacheMixin,
+    PostMixinView,
+    ReplicaReadMixin,
+    cached_lookup,
+)
 from .models import Category, Comment, Post, User
-from .utils import annotation_posts, filter_posts
+from .search import search_posts
+from .utils import annotation_posts, filter_posts, published_posts
 
 
-class HomePageListView(ListView):
+class HomePageListView(
+    ReplicaReadMixin,
+    ConditionalGetMixin,
+    AnonymousPageCacheMixin,
+    PostCardCacheMixin,
+    CursorPaginationMixin,
+    ListView,
+):
     model = Post
     template_name = 'blog/index.html'
-    queryset = annotation_posts(filter_posts(Post.objects.all()))
     paginate_by = 10
+    page_cache_scopes = ('index',)
+
+    def get_queryset(self):
+        # Текущее время в фильтре берётся на каждый запрос
+        return annotation_posts(filter_posts(Post.objects.all()))
+
+    def get_published_filter(self):
+        return Q()
 
 
 class PostCreateView(LoginRequiredMixin, CreateView):
@@ -69,28 +107,35 @@ class PostDeleteView(PostMixinView, DeleteView):
         )
 
 
-class PostDetailView(DetailView):
+class PostDetailView(
+    ReplicaReadMixin,
+    ConditionalGetMixin,
+    AnonymousPageCacheMixin,
+    DetailView,
+):
     model = Post
     template_name = 'blog/detail.html'
     pk_url_kwarg = 'post_id'
+    page_cache_scopes = ('post:{post_id}',)
 
-    def get_object(self):
-        post = get_object_or_404(
-            Post,
+    @cached_lookup
+    def get_object(self, queryset=None):
+        # Автор видит свои посты всегда, остальные — только опубликованные
+        visible = published_posts()
+        if self.request.user.is_authenticated:
+            visible |= Q(author=self.request.user)
+        return get_object_or_404(
+            Post.objects.select_related(
+                'author', 'category', 'location'
+            ).filter(visible),
             pk=self.kwargs[self.pk_url_kwarg],
         )
-        if post.author != self.request.user:
-            return get_object_or_404(
-                filter_posts(Post.objects),
-                pk=self.kwargs[self.pk_url_kwarg],
-            )
-        return post
 
     def get_context_data(self, **kwargs):
         return dict(
             **super().get_context_data(**kwargs),
             form=CommentEditForm(),
-            comments=self.get_object().comments.all().select_related(
+            comments=self.object.comments.all().select_related(
                 'author'
             ),
         )
@@ -104,7 +149,12 @@ class PostDetailView(DetailView):
 
 class CategoryPostListView(HomePageListView):
     template_name = 'blog/category.html'
+    page_cache_scopes = ('category:{category_slug}',)
 
+    def get_published_filter(self):
+        return Q(category__slug=self.kwargs['category_slug'])
+
+    @cached_lookup
     def get_category(self):
         return get_object_or_404(
             Category,
@@ -126,7 +176,12 @@ class CategoryPostListView(HomePageListView):
 
 class UserPostListView(HomePageListView):
     template_name = 'blog/profile.html'
+    page_cache_scopes = ('author:{username}',)
+
+    def get_published_filter(self):
+        return Q(author__username=self.kwargs['username'])
 
+    @cached_lookup
     def get_author(self):
         return get_object_or_404(
             User,
@@ -151,6 +206,35 @@ class UserPostListView(HomePageListView):
         )
 
 
+class PostSearchView(
+    ReplicaReadMixin,
+    AnonymousPageCacheMixin,
+    PostCardCacheMixin,
+    ListView,
+):
+    model = Post
+    template_name = 'blog/search.html'
+    paginate_by = 10
+    page_cache_scopes = ('index',)
+
+    def get_query(self):
+        return self.request.GET.get('q', '').strip()
+
+    def get_queryset(self):
+        return search_posts(
+            annotation_posts(filter_posts(Post.objects.all())),
+            self.get_query(),
+        )
+
+    def get_context_data(self, **kwargs):
+        query = self.get_query()
+        return dict(
+            **super().get_context_data(**kwargs),
+            query=query,
+            page_query=urlencode({'q': query}) + '&',
+        )
+
+
 class UserProfileUpdateView(LoginRequiredMixin, UpdateView):
     model = User
     form_class = UserEditForm
@@ -174,6 +258,7 @@ class CommentCreateView(LoginRequiredMixin, CreateView):
     template_name = 'blog/comment.html'
     pk_url_kwarg = 'post_id'
 
+    @cached_lookup
     def get_post(self):
         return get_object_or_404(
             filter_posts(Post.objects.all()),
@@ -200,3 +285,101 @@ class CommentUpdateView(CommentMixinView, UpdateView):
 
 class CommentDeleteView(CommentMixinView, DeleteView):
     fields = ('text',)
+
+
+class PostFeedView(ReplicaReadMixin, ConditionalGetMixin, View):
+    """Лента Atom или RSS последних публикаций блога."""
+
+    feed_format = 'atom'
+    page_cache_scopes = ('index',)
+    # В ленте нет данных пользователя и CSRF-токена
+    anonymous_only = False
+
+    def get_published_filter(self):
+        return Q()
+
+    def get_feed_object(self):
+        return {
+            'title': 'Блог: последние публикации',
+            'link': reverse('blog:index'),
+            'description': 'Новые публикации всех авторов.',
+        }
+
+    def get(self, request, *args, **kwargs):
+        feed_type = PostFeed(self.feed_format).feed_type
+        timeout = getattr(settings, 'BLOG_FEED_CACHE_TIMEOUT', None)
+        # Дата последней публикации в ключе: отложенный пост
+        # обновляет ленту без сигнала
+        key = get_page_cache_key(
+            request,
+            self.get_page_cache_scopes(),
+            *self.get_page_cache_extra(),
+        )
+        content = cache.get(key) if timeout else None
+        if content is not None:
+            return HttpResponse(content, content_type=feed_type.content_type)
+
+        feed_object = dict(
+            self.get_feed_object(),
+            posts=Post.objects.filter(
+                published_posts(), self.get_published_filter()
+            ),
+        )
+        # Запросы выполняются здесь, поток только пишет XML
+        chunks = PostFeed(self.feed_format).get_feed(
+            feed_object, request
+        ).stream()
+        if timeout:
+            chunks = cache_chunks(chunks, key, timeout)
+        return StreamingHttpResponse(
+            chunks, content_type=feed_type.content_type
+        )
+
+
+class CategoryFeedView(PostFeedView):
+    page_cache_scopes = ('category:{category_slug}',)
+
+    def get_published_filter(self):
+        return Q(category__slug=self.kwargs['category_slug'])
+
+    def get_feed_object(self):
+        category = get_object_or_404(
+            Category,
+            slug=self.kwargs['category_slug'],
+            is_published=True
+        )
+        return {
+            'title': f'Блог: {category.title}',
+            'link': reverse('blog:category_posts', args=[category.slug]),
+            'description': category.description,
+        }
+
+
+class UserFeedView(PostFeedView):
+    page_cache_scopes = ('author:{username}',)
+
+    def get_published_filter(self):
+        return Q(author__username=self.kwargs['username'])
+
+    def get_feed_object(self):
+        author = get_object_or_404(User, username=self.kwargs['username'])
+        return {
+            'title': f'Блог: публикации {author.username}',
+            'link': reverse('blog:profile', args=[author.username]),
+            'description': f'Новые публикации пользователя {author.username}.',
+        }
+
+
+class AutocompleteView(LoginRequiredMixin, View):
+    """Подсказки для полей формы публикации: JSON по началу названия."""
+
+    def get(self, request, kind):
+        if kind not in SOURCES:
+            raise Http404
+        try:
+            limit = min(max(int(request.GET.get('limit', LIMIT)), 0), LIMIT)
+        except ValueError:
+            limit = LIMIT
+        return JsonResponse({
+            'results': search_choices(kind, request.GET.get('q', ''), limit)
+        })
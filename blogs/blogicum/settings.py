@@ -12,6 +12,7 @@ ALLOWED_HOSTS = ['*']
 INSTALLED_APPS = [
     'pages.apps.PagesConfig',
     'blog.apps.BlogConfig',
+    'tasks.apps.TasksConfig',
     'django.contrib.admin',
     'django.contrib.auth',
     'django.contrib.contenttypes',
@@ -22,6 +23,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'blog.middleware.QueryInstrumentationMiddleware',
+    'blog.middleware.PrimaryPinMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -61,6 +64,30 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': 60,
+    },
+    # Реплика для чтения; локально — копия db.sqlite3
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db_replica.sqlite3',
+        'CONN_MAX_AGE': 60,
+        'TEST': {'MIRROR': 'default'},
+    },
+}
+
+DATABASE_ROUTERS = ['blog.routers.ReplicaRouter']
+
+
+# Cache
+# Подойдёт и файловый бэкенд:
+# 'django.core.cache.backends.filebased.FileBasedCache'
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'OPTIONS': {
+            'MAX_ENTRIES': 5000,
+        },
     }
 }
 
@@ -123,3 +150,77 @@ EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
 LOGIN_REDIRECT_URL = 'blog:index'
 
 LOGIN_URL = 'login'
+
+# Курсорная пагинация лент (?after=/?before=) вместо номеров страниц
+BLOG_CURSOR_PAGINATION = False
+
+# Время жизни кэша страниц для анонимных читателей, 0 — без кэша
+BLOG_PAGE_CACHE_TIMEOUT = 60 * 5
+
+# Время жизни кэша карточек публикаций в лентах, 0 — без кэша
+BLOG_POST_CARD_CACHE_TIMEOUT = 60 * 60
+
+# Ленты Atom и RSS: число записей и время жизни кэша, 0 — без кэша
+BLOG_FEED_ITEMS = 20
+BLOG_FEED_CACHE_TIMEOUT = 60 * 15
+
+# Списки админки: выше порога число строк кэшируется; для списка без
+# фильтров его считает фоновая задача, а до того выводится оценка
+BLOG_ADMIN_COUNT_THRESHOLD = 10000
+BLOG_ADMIN_COUNT_CACHE_TIMEOUT = 60 * 5
+BLOG_ADMIN_FULL_RESULT_COUNT = False
+# Комментариев на странице публикации в админке
+BLOG_ADMIN_COMMENTS_PER_PAGE = 50
+# Записей в одном UPDATE/DELETE массовых действий админки
+BLOG_ADMIN_BULK_CHUNK_SIZE = 500
+
+# Фоновые задачи: manage.py runworker
+TASKS_RUN_EAGERLY = False
+TASKS_CONCURRENCY = 2
+TASKS_MAX_ATTEMPTS = 3
+TASKS_RETRY_DELAY = 10
+TASKS_STALE_TIMEOUT = 60 * 10
+
+# Бюджеты SQL-запросов представлений: превышение пишется в лог
+SERVER_TIMING_HEADER = DEBUG
+QUERY_BUDGETS = {
+    'default': {'queries': 10, 'duration_ms': 500},
+    'blog:index': {'queries': 4},
+    'blog:search': {'queries': 4},
+    'blog:category_posts': {'queries': 5},
+    'blog:profile': {'queries': 5},
+    'blog:post_detail': {'queries': 4},
+    'blog:add_comment': {'queries': 2},
+    'blog:edit_comment': {'queries': 3},
+    'blog:delete_comment': {'queries': 3},
+    'blog:edit_profile': {'queries': 2},
+    'blog:create_post': {'queries': 4},
+    'blog:edit_post': {'queries': 5},
+    'blog:delete_post': {'queries': 4},
+}
+
+# Прагмы для каждого нового соединения с SQLite:
+# WAL не блокирует чтение во время записи, busy_timeout в мс
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'cache_size': -20000,
+    'mmap_size': 128 * 1024 * 1024,
+    'temp_store': 'MEMORY',
+}
+
+# Проверять постоянные соединения перед каждым запросом
+DB_HEALTH_CHECKS = True
+
+# Реплики для чтения лент и страниц публикаций, например ['replica'];
+# после записи браузер читает из основной базы DATABASE_PIN_SECONDS секунд
+DATABASE_REPLICAS = []
+DATABASE_PIN_SECONDS = 10
+
+# Сколько публикаций читается из базы за запрос при выгрузке в CSV/JSONL
+BLOG_EXPORT_CHUNK_SIZE = 1000
+
+# Сколько секунд хранятся подсказки для одного префикса; правки записей
+# сбрасывают их раньше
+BLOG_AUTOCOMPLETE_CACHE_TIMEOUT = 60 * 60
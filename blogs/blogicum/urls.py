@@ -1,12 +1,22 @@
 from django.contrib import admin
+from django.contrib.auth import views as auth_views
 from django.contrib.auth.forms import UserCreationForm
 from django.conf import settings
 from django.conf.urls.static import static
 from django.views.generic.edit import CreateView
 from django.urls import include, path, reverse_lazy
 
+from blog.forms import QueuedPasswordResetForm
+
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path(
+        'auth/password_reset/',
+        auth_views.PasswordResetView.as_view(
+            form_class=QueuedPasswordResetForm,
+        ),
+        name='password_reset',
+    ),
     path('auth/', include('django.contrib.auth.urls')),
     path(
         'auth/registration/',
@@ -0,0 +1,39 @@
+// Подсказки для полей с data-autocomplete-url: выбранный id
+// записывается в скрытое поле перед текстовым.
+document.addEventListener('DOMContentLoaded', function () {
+  document.querySelectorAll('[data-autocomplete-url]').forEach(function (box) {
+    var hidden = box.querySelector('input[type=hidden]');
+    var input = box.querySelector('input[type=text]');
+    var list = box.querySelector('datalist');
+    var timer = null;
+
+    function pick() {
+      var option = Array.from(list.options).find(function (item) {
+        return item.value === input.value;
+      });
+      // Изменённый текст без совпадения не оставляет прежний id
+      hidden.value = option ? option.dataset.id : '';
+    }
+
+    input.addEventListener('input', function () {
+      pick();
+      clearTimeout(timer);
+      timer = setTimeout(function () {
+        var url = box.dataset.autocompleteUrl + '?q=' + encodeURIComponent(input.value);
+        fetch(url, {credentials: 'same-origin'})
+          .then(function (response) { return response.json(); })
+          .then(function (data) {
+            list.innerHTML = '';
+            data.results.forEach(function (item) {
+              var option = document.createElement('option');
+              option.value = item.text;
+              option.dataset.id = item.id;
+              list.appendChild(option);
+            });
+            pick();
+          });
+      }, 200);
+    });
+    input.addEventListener('change', pick);
+  });
+});
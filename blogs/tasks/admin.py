@@ -0,0 +1,20 @@
+from django.contrib import admin
+
+from .models import Task
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    """Интерфейс для фоновых задач."""
+
+    list_display = (
+        "name",
+        "status",
+        "attempts",
+        "run_at",
+        "created_at",
+    )
+    list_filter = ("status",)
+    # В аргументах могут быть личные данные: адреса, id пользователей
+    exclude = ("arguments",)
+    readonly_fields = ("last_error",)
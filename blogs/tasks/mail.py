@@ -0,0 +1,56 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.tokens import default_token_generator
+from django.core.mail import send_mail
+from django.template import loader
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+
+from .utils import background
+
+
+@background
+def send_email(subject, message, from_email, recipient_list,
+               html_message=None):
+    send_mail(
+        subject,
+        message,
+        from_email,
+        recipient_list,
+        html_message=html_message,
+    )
+
+
+@background
+def send_password_reset_email(user_pk, to_email, context,
+                              subject_template_name, email_template_name,
+                              from_email, html_email_template_name=None):
+    """Письмо для сброса пароля.
+
+    Ссылка со сроком действия строится здесь: в очереди хранятся только
+    id пользователя и адрес, а не готовый токен.
+    """
+    user = get_user_model()._default_manager.filter(pk=user_pk).first()
+    if user is None:
+        return
+    context = {
+        **context,
+        'email': to_email,
+        'user': user,
+        'uid': urlsafe_base64_encode(force_bytes(user.pk)),
+        'token': default_token_generator.make_token(user),
+    }
+    subject = ''.join(
+        loader.render_to_string(subject_template_name, context).splitlines()
+    )
+    html_message = None
+    if html_email_template_name is not None:
+        html_message = loader.render_to_string(
+            html_email_template_name, context
+        )
+    send_mail(
+        subject,
+        loader.render_to_string(email_template_name, context),
+        from_email,
+        [to_email],
+        html_message=html_message,
+    )
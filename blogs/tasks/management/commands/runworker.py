@@ -0,0 +1,67 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from tasks.utils import (
+    claim_tasks,
+    requeue_stale_tasks,
+    run_pending,
+    run_task_in_thread,
+)
+
+
+class Command(BaseCommand):
+    help = 'Выполняет фоновые задачи из очереди.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=getattr(settings, 'TASKS_CONCURRENCY', 2),
+            help='Сколько задач выполнять одновременно.',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=1.0,
+            help='Пауза в секундах, когда очередь пуста.',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Выполнить готовые задачи и завершиться.',
+        )
+
+    def handle(self, *args, concurrency, poll_interval, once, **options):
+        requeued = requeue_stale_tasks()
+        if requeued:
+            self.stdout.write(f'Возвращено в очередь задач: {requeued}.')
+
+        if once:
+            results = run_pending()
+            self.stdout.write(self.style.SUCCESS(
+                f'Выполнено задач: {sum(results)}, с ошибкой: '
+                f'{len(results) - sum(results)}.'
+            ))
+            return
+
+        running = set()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            while True:
+                # Освободившиеся потоки сразу берут новые задачи,
+                # не дожидаясь самой долгой из уже запущенных
+                for pk in claim_tasks(concurrency - len(running)):
+                    running.add(pool.submit(run_task_in_thread, pk))
+                if not running:
+                    time.sleep(poll_interval)
+                    continue
+                _, running = wait(
+                    running,
+                    timeout=(
+                        None if len(running) >= concurrency
+                        else poll_interval
+                    ),
+                    return_when=FIRST_COMPLETED,
+                )
@@ -0,0 +1,107 @@
+import json
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue(name, args=(), kwargs=None, max_attempts=None, run_at=None):
+    """Ставит вызов функции `name` в очередь.
+
+    Аргументы должны сериализоваться в JSON. Запись создаётся в текущей
+    транзакции, поэтому воркер увидит задачу только после её фиксации.
+    """
+    if getattr(settings, 'TASKS_RUN_EAGERLY', False):
+        import_string(name)(*args, **(kwargs or {}))
+        return None
+    return Task.objects.create(
+        name=name,
+        arguments=json.dumps([list(args), kwargs or {}]),
+        max_attempts=max_attempts or getattr(
+            settings, 'TASKS_MAX_ATTEMPTS', 3
+        ),
+        run_at=run_at or timezone.now(),
+    )
+
+
+def background(func):
+    """Добавляет функции метод `delay` для запуска в воркере."""
+    name = f'{func.__module__}.{func.__qualname__}'
+
+    def delay(*args, **kwargs):
+        return enqueue(name, args, kwargs)
+
+    func.delay = delay
+    return func
+
+
+def claim_tasks(limit):
+    """Забирает готовые к выполнению задачи.
+
+    Задача достаётся тому воркеру, чей UPDATE её изменил.
+    """
+    now = timezone.now()
+    candidates = Task.objects.filter(
+        status=Task.PENDING, run_at__lte=now
+    ).values_list('pk', flat=True)[:limit]
+    return [
+        pk for pk in candidates
+        if Task.objects.filter(pk=pk, status=Task.PENDING).update(
+            status=Task.RUNNING, locked_at=now
+        )
+    ]
+
+
+def requeue_stale_tasks():
+    """Возвращает в очередь задачи воркеров, завершившихся аварийно."""
+    timeout = getattr(settings, 'TASKS_STALE_TIMEOUT', 60 * 10)
+    return Task.objects.filter(
+        status=Task.RUNNING,
+        locked_at__lt=timezone.now() - timedelta(seconds=timeout),
+    ).update(status=Task.PENDING, locked_at=None)
+
+
+def run_task(pk):
+    task = Task.objects.get(pk=pk)
+    args, kwargs = json.loads(task.arguments)
+    try:
+        import_string(task.name)(*args, **kwargs)
+    except Exception:
+        task.attempts += 1
+        task.last_error = traceback.format_exc()
+        task.locked_at = None
+        if task.attempts < task.max_attempts:
+            # Экспоненциальная пауза перед повтором
+            delay = getattr(settings, 'TASKS_RETRY_DELAY', 10)
+            task.status = Task.PENDING
+            task.run_at = timezone.now() + timedelta(
+                seconds=delay * 2 ** (task.attempts - 1)
+            )
+        else:
+            task.status = Task.FAILED
+            logger.error('Задача %s завершилась ошибкой', task)
+        task.save()
+        return False
+    task.delete()
+    return True
+
+
+def run_pending(limit=100):
+    """Выполняет готовые задачи в текущем потоке."""
+    return [run_task(pk) for pk in claim_tasks(limit)]
+
+
+def run_task_in_thread(pk):
+    close_old_connections()
+    try:
+        return run_task(pk)
+    finally:
+        close_old_connections()
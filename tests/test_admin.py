@@ -0,0 +1,264 @@
+import pytest
+from bs4 import BeautifulSoup
+from django.contrib.admin.models import CHANGE, DELETION, LogEntry
+from django.contrib.auth.models import Permission
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Post
+from blog.paginator import EstimatedCountPaginator
+from tasks.utils import run_pending
+
+pytestmark = [pytest.mark.django_db]
+
+
+def count_queries(admin_client, url='/admin/blog/post/'):
+    with CaptureQueriesContext(connection) as queries:
+        assert admin_client.get(url).status_code == 200
+    return len(queries)
+
+
+def test_post_changelist_queries_do_not_grow(
+        mixer, admin_client, published_category, published_location
+):
+    def add_posts(count):
+        posts = mixer.cycle(count).blend(
+            'blog.Post', category=published_category,
+            location=published_location, image='',
+        )
+        for post in posts:
+            mixer.cycle(2).blend('blog.Comment', post=post)
+
+    add_posts(2)
+    few = count_queries(admin_client)
+    add_posts(20)
+    many = count_queries(admin_client)
+    assert few == many, (
+        'Убедитесь, что число запросов списка публикаций в админке не'
+        f' зависит от числа строк: {few} запросов для 2 строк и {many}'
+        ' для 22.'
+    )
+
+
+def test_post_changelist_sorted_by_comment_count(
+        mixer, admin_client, post_with_published_location
+):
+    mixer.cycle(3).blend('blog.Comment', post=post_with_published_location)
+    mixer.blend('blog.Post', category=post_with_published_location.category,
+                image='')
+    response = admin_client.get('/admin/blog/post/', {'o': '-5'})
+    result = list(response.context['cl'].result_list)
+    assert result[0] == post_with_published_location
+    assert result[0].comment_count == 3
+
+
+def test_estimated_count_above_threshold(
+        settings, mixer, published_category, django_assert_num_queries
+):
+    settings.BLOG_ADMIN_COUNT_THRESHOLD = 3
+    posts = mixer.cycle(5).blend(
+        'blog.Post', category=published_category, image=''
+    )
+    Post.objects.filter(pk=posts[0].pk).delete()
+
+    filtered = Post.objects.filter(category=published_category)
+    assert EstimatedCountPaginator(filtered, 2).count == 4
+    with django_assert_num_queries(1):
+        assert EstimatedCountPaginator(filtered, 2).count == 4, (
+            'Убедитесь, что точное число строк выше порога кэшируется.'
+        )
+
+
+def test_table_count_with_pk_gaps(
+        settings, mixer, admin_client, published_category
+):
+    settings.BLOG_ADMIN_COUNT_THRESHOLD = 3
+    posts = mixer.cycle(8).blend(
+        'blog.Post', category=published_category, image=''
+    )
+    Post.objects.filter(pk__in=[post.pk for post in posts[1:4]]).delete()
+
+    paginator = EstimatedCountPaginator(Post.objects.all(), 2)
+    assert paginator.count == posts[-1].pk and paginator.estimated
+    content = admin_client.get('/admin/blog/post/').content.decode()
+    assert f'около {posts[-1].pk}' in content, (
+        'Убедитесь, что оценка числа строк помечена в списке как'
+        ' приблизительная.'
+    )
+
+    run_pending()
+    paginator = EstimatedCountPaginator(Post.objects.all(), 2)
+    assert (paginator.count, paginator.estimated) == (5, False), (
+        'Убедитесь, что после фоновой задачи список без фильтров выводит'
+        ' точное число строк без пропущенных id.'
+    )
+
+
+def test_post_changelist_skips_full_count(
+        admin_client, post_with_published_location
+):
+    with CaptureQueriesContext(connection) as queries:
+        admin_client.get('/admin/blog/post/', {'is_published__exact': 1})
+    counts = [
+        query['sql'] for query in queries.captured_queries
+        if 'COUNT(' in query['sql']
+    ]
+    assert len(counts) == 1, (
+        'Убедитесь, что список публикаций в админке не считает общее'
+        ' число строк без фильтров.'
+    )
+
+
+def test_author_filter_is_searchable(
+        mixer, admin_client, post_with_published_location
+):
+    author = post_with_published_location.author
+    mixer.cycle(15).blend('auth.User')
+    response = admin_client.get('/admin/blog/post/')
+    content = response.content.decode()
+    assert 'name="author_q"' in content
+    assert author.username not in content.split('id="changelist-filter"')[1]
+
+    response = admin_client.get(
+        '/admin/blog/post/', {'author_q': author.username[:4]}
+    )
+    content = response.content.decode()
+    assert f'author__id__exact={author.pk}' in content, (
+        'Убедитесь, что фильтр по автору ищет пользователей по началу'
+        ' имени.'
+    )
+
+    response = admin_client.get(
+        '/admin/blog/post/', {'author__id__exact': author.pk}
+    )
+    assert list(response.context['cl'].result_list) == [
+        post_with_published_location
+    ]
+
+
+def test_comment_inline_is_paginated(
+        settings, mixer, admin_client, post_with_published_location
+):
+    settings.BLOG_ADMIN_COMMENTS_PER_PAGE = 3
+    post = post_with_published_location
+    comments = mixer.cycle(7).blend('blog.Comment', post=post)
+    url = f'/admin/blog/post/{post.pk}/change/'
+
+    def shown(response):
+        formset = response.context['inline_admin_formsets'][0].formset
+        return [form.instance.pk for form in formset.forms]
+
+    response = admin_client.get(url)
+    assert shown(response) == [comment.pk for comment in comments[:3]], (
+        'Убедитесь, что комментарии на странице публикации в админке'
+        ' выводятся постранично.'
+    )
+    assert 'comments_page=2' in response.content.decode()
+    assert shown(admin_client.get(url, {'comments_page': 3})) == [
+        comments[-1].pk
+    ]
+    links = BeautifulSoup(admin_client.get(url, {
+        '_changelist_filters': 'is_published__exact=1', 'comments_page': 2,
+    }).content.decode(), features='html.parser').select('p.paginator a')
+    assert all(
+        '_changelist_filters=is_published__exact%3D1' in link['href']
+        for link in links
+    ) and len(links) == 2, (
+        'Убедитесь, что ссылки на страницы комментариев сохраняют'
+        ' параметры адреса, например фильтры списка.'
+    )
+
+    few = count_queries(admin_client, url)
+    mixer.cycle(20).blend('blog.Comment', post=post)
+    assert count_queries(admin_client, url) == few, (
+        'Убедитесь, что авторы комментариев загружаются тем же запросом.'
+    )
+
+
+def run_action(admin_client, url, action, objects):
+    return admin_client.post(url, {
+        'action': action,
+        '_selected_action': [obj.pk for obj in objects],
+    }, follow=True)
+
+
+def test_bulk_unpublish_posts(
+        settings, mixer, client, admin_client, published_category
+):
+    settings.BLOG_ADMIN_BULK_CHUNK_SIZE = 2
+    posts = mixer.cycle(5).blend(
+        'blog.Post', category=published_category, is_published=True,
+        image='',
+    )
+    assert posts[0].title in client.get('/').content.decode()
+
+    with CaptureQueriesContext(connection) as queries:
+        response = run_action(
+            admin_client, '/admin/blog/post/', 'unpublish', posts
+        )
+    updates = [
+        query for query in queries.captured_queries
+        if query['sql'].startswith('UPDATE "blog_post"')
+    ]
+    assert len(updates) == 3, (
+        'Убедитесь, что публикации снимаются одним UPDATE на пачку.'
+    )
+    assert 'Изменено записей: 5.' in response.content.decode()
+    assert LogEntry.objects.filter(action_flag=CHANGE).count() == 5, (
+        'Убедитесь, что массовые изменения записываются в журнал админки.'
+    )
+    assert not Post.objects.filter(is_published=True).exists()
+    assert posts[0].title not in client.get('/').content.decode(), (
+        'Убедитесь, что массовое снятие с публикации сбрасывает кэш'
+        ' страниц.'
+    )
+
+
+def test_bulk_actions_require_change_permission(
+        mixer, client, post_with_published_location
+):
+    staff = mixer.blend('auth.User', is_staff=True)
+    staff.user_permissions.add(
+        Permission.objects.get(codename='view_post')
+    )
+    client.force_login(staff)
+    run_action(client, '/admin/blog/post/', 'unpublish',
+               [post_with_published_location])
+    post_with_published_location.refresh_from_db()
+    assert post_with_published_location.is_published, (
+        'Убедитесь, что снять публикации с публикации может только'
+        ' пользователь с правом на изменение.'
+    )
+
+
+def test_bulk_unpublish_category(
+        admin_client, client, post_with_published_location
+):
+    category = post_with_published_location.category
+    client.get('/')
+    run_action(admin_client, '/admin/blog/category/', 'unpublish', [category])
+    category.refresh_from_db()
+    assert not category.is_published
+    assert post_with_published_location.title not in (
+        client.get('/').content.decode()
+    )
+
+
+def test_bulk_delete_comments(
+        mixer, admin_client, post_with_published_location
+):
+    post = post_with_published_location
+    comments = mixer.cycle(4).blend('blog.Comment', post=post)
+    response = run_action(
+        admin_client, '/admin/blog/comment/', 'delete_comments',
+        comments[:3],
+    )
+    assert 'Удалено комментариев: 3.' in response.content.decode()
+    assert LogEntry.objects.filter(action_flag=DELETION).count() == 3, (
+        'Убедитесь, что массовое удаление записывается в журнал админки.'
+    )
+    post.refresh_from_db()
+    assert post.comment_count == 1, (
+        'Убедитесь, что после массового удаления комментариев счётчик'
+        ' публикации пересчитывается.'
+    )
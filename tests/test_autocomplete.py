@@ -0,0 +1,107 @@
+import pytest
+from bs4 import BeautifulSoup
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_autocomplete_prefix_search(
+        mixer, user_client, django_assert_num_queries
+):
+    mixer.blend('blog.Category', title='Путешествия', is_published=True)
+    mixer.blend('blog.Category', title='Путь домой', is_published=True)
+    mixer.blend('blog.Category', title='Путеводитель', is_published=False)
+    mixer.blend('blog.Category', title='Кулинария', is_published=True)
+
+    response = user_client.get('/autocomplete/category/', {'q': 'пут'})
+    assert [item['text'] for item in response.json()['results']] == [
+        'Путешествия', 'Путь домой'
+    ], (
+        'Убедитесь, что подсказки ищут опубликованные категории по началу'
+        ' названия.'
+    )
+    response = user_client.get(
+        '/autocomplete/category/', {'q': 'пут', 'limit': 1}
+    )
+    assert len(response.json()['results']) == 1
+
+    # Сессия, пользователь и одна выборка по индексу
+    with django_assert_num_queries(3):
+        user_client.get('/autocomplete/category/', {'q': 'ку'})
+    # Повторный префикс берётся из кэша
+    with django_assert_num_queries(2):
+        assert user_client.get(
+            '/autocomplete/category/', {'q': 'Ку'}
+        ).json()['results'][0]['text'] == 'Кулинария'
+
+
+def test_autocomplete_cache_invalidated(mixer, user_client):
+    location = mixer.blend('blog.Location', name='Москва', is_published=True)
+    assert user_client.get(
+        '/autocomplete/location/', {'q': 'мос'}
+    ).json()['results'] == [{'id': location.pk, 'text': 'Москва'}]
+    location.is_published = False
+    location.save()
+    assert user_client.get(
+        '/autocomplete/location/', {'q': 'мос'}
+    ).json()['results'] == []
+
+
+def test_autocomplete_requires_login(client):
+    assert client.get('/autocomplete/category/').status_code == 302
+
+
+def test_post_form_uses_autocomplete(user_client, post_with_published_location):
+    post = post_with_published_location
+    content = user_client.get(f'/posts/{post.id}/edit/').content.decode()
+    soup = BeautifulSoup(content, features='html.parser')
+    assert not soup.find('select', {'name': 'category'}), (
+        'Убедитесь, что форма публикации не выводит список всех категорий.'
+    )
+    assert soup.find('input', {'name': 'category'})['value'] == str(
+        post.category.pk
+    )
+    assert soup.find('input', {'id': 'id_category'})['value'] == (
+        post.category.title
+    )
+
+
+def test_autocomplete_ignores_mixed_case(mixer, user_client):
+    location = mixer.blend(
+        'blog.Location', name='Санкт-Петербург', is_published=True
+    )
+    for query in ('сАнкт', 'САНКТ-п', 'санкт'):
+        assert user_client.get(
+            '/autocomplete/location/', {'q': query}
+        ).json()['results'] == [
+            {'id': location.pk, 'text': 'Санкт-Петербург'}
+        ], (
+            'Убедитесь, что подсказки не зависят от регистра букв запроса.'
+        )
+    location.name = 'Петергоф'
+    location.save(update_fields=['name'])
+    assert user_client.get(
+        '/autocomplete/location/', {'q': 'пЕТЕР'}
+    ).json()['results'] == [{'id': location.pk, 'text': 'Петергоф'}]
+
+
+def test_admin_post_form_uses_autocomplete(
+        admin_client, post_with_published_location
+):
+    post = post_with_published_location
+    content = admin_client.get(
+        f'/admin/blog/post/{post.id}/change/'
+    ).content.decode()
+    soup = BeautifulSoup(content, features='html.parser')
+    for name, url in (
+        ('category', '/autocomplete/category/'),
+        ('location', '/autocomplete/location/'),
+    ):
+        assert not soup.find('select', {'name': name}), (
+            'Убедитесь, что админка не выводит список всех категорий'
+            ' и местоположений.'
+        )
+        hidden = soup.find('input', {'name': name})
+        assert hidden.find_parent('div')['data-autocomplete-url'] == url
+    assert soup.find('input', {'name': 'category'})['value'] == str(
+        post.category.pk
+    )
@@ -0,0 +1,52 @@
+import random
+
+import pytest
+from django.conf import settings
+
+from blog.benchmark import Replayer, compare, load_mix, percentile, seed
+
+
+def test_percentile_edge_cases():
+    assert percentile([], 95) is None, (
+        'Убедитесь, что перцентиль пустой выборки не вызывает ошибку.'
+    )
+    assert percentile([7], 50) == percentile([7], 99) == 7
+    assert percentile([3, 1, 2], 100) == 3
+    assert percentile([3, 1, 2], 0) == 1
+    assert percentile(list(range(1, 101)), 95) == 95
+
+
+def test_compare_detects_regression():
+    baseline = {
+        'blog:index': {'p95_ms': 10.0, 'queries': 4},
+        'blog:search': {'p95_ms': 0, 'queries': 4},
+    }
+    results = {
+        'blog:index': {'p95_ms': 15.0, 'queries': 6},
+        'blog:search': {'p95_ms': 3.0, 'queries': 4},
+        'blog:feed': {'p95_ms': 1.0, 'queries': 1},
+    }
+    assert compare(results, baseline) == {
+        'blog:index': {'p95_change_pct': 50.0, 'queries_change': 2},
+        'blog:search': {'p95_change_pct': None, 'queries_change': 0},
+    }, (
+        'Убедитесь, что сравнение показывает рост p95 и числа запросов'
+        ' относительно базового прогона.'
+    )
+
+
+@pytest.mark.django_db
+def test_replay_request_mix():
+    from blogicum.wsgi import application
+
+    rng = random.Random(0)
+    authors = seed(3, 2, 2, 25, 10, rng)
+    mix = load_mix(settings.BASE_DIR / 'benchmarks' / 'request_mix.jsonl')
+    results = Replayer(application, authors[0], rng).run(mix, 40)
+
+    assert sum(row['requests'] for row in results.values()) == 40
+    for name, row in results.items():
+        assert row['statuses'] == [200], (
+            f'Убедитесь, что запросы смеси `{name}` выполняются успешно.'
+        )
+        assert row['p50_ms'] <= row['p95_ms'] <= row['p99_ms']
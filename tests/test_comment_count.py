@@ -0,0 +1,103 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from blog.cache import get_versions
+from blog.models import Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_comment_count_follows_comments(
+        user_client, post_with_published_location
+):
+    post = post_with_published_location
+    user_client.post(
+        f'/posts/{post.id}/comment/', data={'text': 'Новый комментарий'}
+    )
+    post.refresh_from_db()
+    assert post.comment_count == 1, (
+        'Убедитесь, что после добавления комментария счётчик комментариев'
+        ' публикации увеличивается.'
+    )
+
+    comment = Comment.objects.get(post=post)
+    user_client.post(f'/posts/{post.id}/delete_comment/{comment.id}/')
+    post.refresh_from_db()
+    assert post.comment_count == 0, (
+        'Убедитесь, что после удаления комментария счётчик комментариев'
+        ' публикации уменьшается.'
+    )
+
+
+def test_recount_comments_repairs_drift(comment_to_a_post):
+    post = comment_to_a_post.post
+    Post.objects.filter(pk=post.pk).update(comment_count=42)
+
+    call_command('recount_comments', stdout=StringIO())
+
+    post.refresh_from_db()
+    assert post.comment_count == 1, (
+        'Убедитесь, что команда `recount_comments` исправляет расхождения'
+        ' в счётчиках комментариев.'
+    )
+
+
+def test_recount_comments_invalidates_cache(comment_to_a_post):
+    post = comment_to_a_post.post
+    Post.objects.filter(pk=post.pk).update(comment_count=42)
+    before = get_versions([f'post:{post.pk}', 'index'])
+
+    call_command('recount_comments', stdout=StringIO())
+
+    after = get_versions([f'post:{post.pk}', 'index'])
+    assert all(old != new for old, new in zip(before, after)), (
+        'Убедитесь, что команда `recount_comments` сбрасывает кэш страниц'
+        ' и карточек исправленных публикаций.'
+    )
+
+
+def test_post_delete_queries_do_not_grow_with_comments(
+        mixer, published_category
+):
+    def delete_post_with(count):
+        post = mixer.blend('blog.Post', category=published_category,
+                           image='')
+        mixer.cycle(count).blend('blog.Comment', post=post)
+        with CaptureQueriesContext(connection) as queries:
+            post.delete()
+        return len(queries)
+
+    few = delete_post_with(2)
+    many = delete_post_with(200)
+    # Django удаляет связанные строки пачками по 100
+    assert many <= few + 2, (
+        'Убедитесь, что каскадное удаление комментариев не выполняет'
+        f' запросов на каждый комментарий: {few} запросов для 2'
+        f' комментариев и {many} для 200.'
+    )
+
+
+def test_failed_post_delete_keeps_comment_receivers(
+        monkeypatch, mixer, post_with_published_location
+):
+    post = post_with_published_location
+    comments = mixer.cycle(2).blend('blog.Comment', post=post)
+
+    def fail(scopes):
+        raise RuntimeError('Ошибка удаления')
+
+    monkeypatch.setattr('blog.signals.invalidate', fail)
+    with pytest.raises(RuntimeError), transaction.atomic():
+        post.delete()
+    monkeypatch.undo()
+
+    comments[0].delete()
+    post.refresh_from_db()
+    assert post.comment_count == 1, (
+        'Убедитесь, что после неудачного удаления публикации счётчик её'
+        ' комментариев снова обновляется.'
+    )
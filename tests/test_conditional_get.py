@@ -0,0 +1,109 @@
+import time
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def urls(post):
+    return (
+        '/',
+        f'/category/{post.category.slug}/',
+        f'/profile/{post.author.username}/',
+        f'/posts/{post.id}/',
+    )
+
+
+def test_not_modified_costs_one_query(
+        client, post_with_published_location, django_assert_max_num_queries
+):
+    for url in urls(post_with_published_location):
+        etag = client.get(url)['ETag']
+        with django_assert_max_num_queries(1):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304, (
+            f'Убедитесь, что страница `{url}` отвечает 304 Not Modified,'
+            ' если ETag совпадает.'
+        )
+
+
+def test_if_modified_since(client, post_with_published_location):
+    for url in urls(post_with_published_location):
+        last_modified = client.get(url)['Last-Modified']
+        response = client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == 304
+
+
+def test_validators_change_with_content(
+        mixer, client, post_with_published_location
+):
+    post = post_with_published_location
+    etags = {url: client.get(url)['ETag'] for url in urls(post)}
+    mixer.blend('blog.Comment', post=post)
+    for url, etag in etags.items():
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200, (
+            f'Убедитесь, что после нового комментария страница `{url}`'
+            ' отдаётся заново.'
+        )
+
+
+def test_validators_change_with_author_name(
+        mixer, client, post_with_published_location
+):
+    post = post_with_published_location
+    commented = mixer.blend(
+        'blog.Post', category=post.category, image='', is_published=True
+    )
+    mixer.blend('blog.Comment', post=commented, author=post.author)
+    pages = (f'/posts/{post.id}/', f'/posts/{commented.id}/')
+    etags = {url: client.get(url)['ETag'] for url in pages}
+    post.author.username = 'renamed-author'
+    post.author.save()
+    for url, etag in etags.items():
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            f'Убедитесь, что после смены имени автора страница `{url}`'
+            ' отдаётся заново.'
+        )
+        assert 'renamed-author' in response.content.decode()
+
+
+def test_logged_in_pages_are_not_conditional(
+        user_client, post_with_published_location
+):
+    for url in urls(post_with_published_location):
+        response = user_client.get(url)
+        assert not response.has_header('ETag'), (
+            f'Убедитесь, что страница `{url}` для вошедшего пользователя'
+            ' не отдаёт ETag: в ней CSRF-токен и имя пользователя.'
+        )
+
+
+def test_page_cache_follows_scheduled_post(
+        mixer, client, post_with_published_location
+):
+    post = post_with_published_location
+    Post.objects.filter(pk=post.pk).update(
+        pub_date=timezone.now() - timedelta(days=1)
+    )
+    scheduled = mixer.blend(
+        'blog.Post', category=post.category, image='', is_published=True,
+        pub_date=timezone.now() + timedelta(seconds=1),
+    )
+    response = client.get('/')
+    assert scheduled.title not in response.content.decode()
+    # Дата публикации наступает без сигнала
+    time.sleep(1.1)
+    response = client.get('/', HTTP_IF_NONE_MATCH=response['ETag'])
+    assert scheduled.title in response.content.decode(), (
+        'Убедитесь, что кэш страницы и ETag обновляются, когда выходит'
+        ' отложенная публикация.'
+    )
+
+
+def test_page_number_in_etag(client, post_with_published_location):
+    assert client.get('/')['ETag'] != client.get('/?page=1')['ETag']
@@ -0,0 +1,48 @@
+import sqlite3
+
+import pytest
+from django.conf import settings
+from django.db import connection
+
+from blog.benchmark import sqlite_concurrency
+from blog.db import apply_pragmas
+
+
+@pytest.mark.django_db
+def test_pragmas_applied_to_connection():
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA busy_timeout')
+        busy_timeout, = cursor.fetchone()
+    assert busy_timeout == settings.SQLITE_PRAGMAS['busy_timeout'], (
+        'Убедитесь, что прагмы из `SQLITE_PRAGMAS` применяются к каждому'
+        ' новому соединению с базой.'
+    )
+
+
+def test_apply_pragmas_enables_wal(tmp_path):
+    db = sqlite3.connect(tmp_path / 'wal.sqlite3')
+    apply_pragmas(db, settings.SQLITE_PRAGMAS)
+    assert db.execute('PRAGMA journal_mode').fetchone() == ('wal',)
+    assert db.execute('PRAGMA synchronous').fetchone() == (1,)
+    db.close()
+
+
+def test_sqlite_concurrency(tmp_path):
+    row = sqlite_concurrency(
+        str(tmp_path / 'bench.sqlite3'), settings.SQLITE_PRAGMAS,
+        readers=2, writers=1, duration=0.2,
+    )
+    assert row['writes_per_s'] > 0 and row['reads_per_s'] > 0
+    assert row['errors'] == 0
+
+
+def test_unusable_persistent_connection_closed(client, monkeypatch, db):
+    monkeypatch.setattr(connection, 'is_usable', lambda: False)
+    monkeypatch.setitem(connection.settings_dict, 'CONN_MAX_AGE', 60)
+    closed = []
+    monkeypatch.setattr(connection, 'close', lambda: closed.append(True))
+    client.get('/')
+    assert closed, (
+        'Убедитесь, что перед запросом неработающее постоянное соединение'
+        ' закрывается.'
+    )
@@ -0,0 +1,58 @@
+import io
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+
+from blog.dump import iter_json_array
+from blog.models import Category, Comment, Location, Post
+
+pytestmark = [pytest.mark.django_db]
+
+DB_JSON = Path(settings.BASE_DIR) / 'db.json'
+
+
+def test_iter_json_array_reads_across_chunks(monkeypatch):
+    monkeypatch.setattr('blog.dump.CHUNK_SIZE', 7)
+    source = io.StringIO('[{"a": "x, ]"}, {"b": [1, 2]}\n]')
+    assert list(iter_json_array(source)) == [{'a': 'x, ]'}, {'b': [1, 2]}]
+
+
+def test_import_blog_dump():
+    call_command('import_blog_dump', str(DB_JSON), batch_size=5,
+                 stdout=StringIO())
+    assert (
+        get_user_model().objects.count(), Category.objects.count(),
+        Location.objects.count(), Post.objects.count(),
+    ) == (4, 6, 12, 39), (
+        'Убедитесь, что команда `import_blog_dump` загружает все записи'
+        ' блога из дампа.'
+    )
+    post = Post.objects.get(pk=1)
+    assert post.excerpt, (
+        'Убедитесь, что при загрузке дампа заполняется анонс публикации.'
+    )
+    assert post.created_at.year < 2026, (
+        'Убедитесь, что при загрузке сохраняются даты из дампа.'
+    )
+
+
+@pytest.mark.parametrize('name', ['dump.json.gz', 'dump.jsonl'])
+def test_export_import_roundtrip(tmp_path, mixer, name):
+    post = mixer.blend('blog.Post', category__is_published=True)
+    mixer.cycle(3).blend('blog.Comment', post=post, author=post.author)
+    path = str(tmp_path / name)
+    call_command('export_blog_dump', path, stdout=StringIO())
+
+    Comment.objects.all().delete()
+    Post.objects.all().delete()
+    call_command('import_blog_dump', path, ignore_conflicts=True,
+                 stdout=StringIO())
+    post = Post.objects.get(pk=post.pk)
+    assert post.comment_count == 3, (
+        'Убедитесь, что дамп, выгруженный `export_blog_dump`, загружается'
+        ' обратно вместе с комментариями.'
+    )
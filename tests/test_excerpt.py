@@ -0,0 +1,45 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_excerpt_saved_with_post(post_with_published_location):
+    post = post_with_published_location
+    post.text = ' '.join(f'слово{i}' for i in range(20))
+    post.save()
+    post.refresh_from_db()
+    assert post.excerpt == ' '.join(f'слово{i}' for i in range(10)) + ' …', (
+        'Убедитесь, что при сохранении публикации заполняется начало текста.'
+    )
+
+
+def test_list_pages_do_not_load_text(
+        user_client, post_with_published_location
+):
+    with CaptureQueriesContext(connection) as ctx:
+        response = user_client.get('/')
+    post_queries = [
+        query['sql'] for query in ctx.captured_queries
+        if 'FROM "blog_post"' in query['sql'] and 'ORDER BY' in query['sql']
+    ]
+    assert post_queries
+    assert all('"blog_post"."text"' not in sql for sql in post_queries), (
+        'Убедитесь, что лента не загружает полный текст публикаций.'
+    )
+    assert post_with_published_location.excerpt in response.content.decode()
+
+
+def test_backfill_excerpts(post_with_published_location):
+    Post.objects.update(excerpt='')
+    call_command('backfill_excerpts', stdout=StringIO())
+    post_with_published_location.refresh_from_db()
+    assert post_with_published_location.excerpt, (
+        'Убедитесь, что команда `backfill_excerpts` заполняет начало текста.'
+    )
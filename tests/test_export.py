@@ -0,0 +1,78 @@
+import csv
+import json
+from datetime import datetime, timezone
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def export_posts(mixer, user, another_user, published_category):
+    early = mixer.blend(
+        'blog.Post', author=user, category=published_category, image='',
+        pub_date=datetime(2020, 1, 10, tzinfo=timezone.utc),
+    )
+    late = mixer.blend(
+        'blog.Post', author=another_user, category=published_category,
+        image='', pub_date=datetime(2021, 6, 1, tzinfo=timezone.utc),
+    )
+    mixer.cycle(2).blend('blog.Comment', post=early)
+    return early, late
+
+
+def run_export(**options):
+    out = StringIO()
+    call_command('export_posts', stdout=out, **options)
+    return out.getvalue()
+
+
+def test_export_posts_jsonl(export_posts, django_assert_num_queries):
+    early, late = export_posts
+    # Публикации и комментарии читаются двумя курсорами при любой пачке
+    with django_assert_num_queries(2):
+        lines = run_export(format='jsonl', batch_size=1).splitlines()
+    records = [json.loads(line) for line in lines]
+    assert [record['id'] for record in records] == [early.pk, late.pk], (
+        'Убедитесь, что команда `export_posts` выгружает по одной'
+        ' публикации на строку JSON lines.'
+    )
+    assert len(records[0]['comments']) == 2, (
+        'Убедитесь, что публикации выгружаются вместе с комментариями.'
+    )
+    assert records[0]['author'] == early.author.username
+
+
+def test_export_posts_csv_filters(export_posts):
+    early, late = export_posts
+    rows = list(csv.DictReader(StringIO(run_export(
+        date_from=datetime(2021, 1, 1).date(),
+        author=late.author.username,
+    ))))
+    assert [(row['type'], row['id']) for row in rows] == [
+        ('post', str(late.pk))
+    ], (
+        'Убедитесь, что команда `export_posts` учитывает фильтры по дате'
+        ' и автору.'
+    )
+    rows = list(csv.DictReader(StringIO(run_export(
+        category=early.category.slug, date_to=datetime(2020, 12, 31).date(),
+    ))))
+    assert [row['type'] for row in rows] == ['post', 'comment', 'comment']
+    assert {row['post_id'] for row in rows[1:]} == {str(early.pk)}
+
+
+def test_admin_export_action_streams(export_posts, admin_client):
+    early, late = export_posts
+    response = admin_client.post('/admin/blog/post/', {
+        'action': 'export_jsonl',
+        '_selected_action': [early.pk],
+    })
+    assert response.streaming, (
+        'Убедитесь, что выгрузка из админки отдаётся потоковым ответом.'
+    )
+    assert 'attachment' in response['Content-Disposition']
+    lines = b''.join(response.streaming_content).decode().splitlines()
+    assert [json.loads(line)['id'] for line in lines] == [early.pk]
@@ -0,0 +1,99 @@
+import time
+from datetime import timedelta
+
+import pytest
+from bs4 import BeautifulSoup
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+def feed_urls(post):
+    return (
+        '/feed/',
+        '/feed/rss/',
+        f'/category/{post.category.slug}/feed/',
+        f'/category/{post.category.slug}/feed/rss/',
+        f'/profile/{post.author.username}/feed/',
+        f'/profile/{post.author.username}/feed/rss/',
+    )
+
+
+def read(response):
+    assert response.status_code == 200
+    if response.streaming:
+        return b''.join(response.streaming_content).decode()
+    return response.content.decode()
+
+
+def test_feeds_list_published_posts(
+        mixer, client, post_with_published_location
+):
+    post = post_with_published_location
+    mixer.blend(
+        'blog.Post', author=post.author, category=post.category,
+        is_published=False, image='',
+    )
+    for url in feed_urls(post):
+        content = read(client.get(url))
+        soup = BeautifulSoup(content, features='html.parser')
+        entries = soup.find_all('entry') or soup.find_all('item')
+        assert [entry.title.text for entry in entries] == [post.title], (
+            f'Убедитесь, что лента `{url}` содержит только опубликованные'
+            ' посты.'
+        )
+
+
+def test_feed_limited_to_latest(
+        settings, mixer, client, user, published_category
+):
+    settings.BLOG_FEED_ITEMS = 3
+    mixer.cycle(5).blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=True, image='',
+    )
+    soup = BeautifulSoup(read(client.get('/feed/')), features='html.parser')
+    assert len(soup.find_all('entry')) == 3
+
+
+def test_feed_cached_and_invalidated(
+        client, post_with_published_location, django_assert_num_queries
+):
+    post = post_with_published_location
+    read(client.get('/feed/'))
+    with django_assert_num_queries(0):
+        assert post.title in read(client.get('/feed/'))
+
+    post.title = 'Новый заголовок для ленты'
+    post.save()
+    assert post.title in read(client.get('/feed/')), (
+        'Убедитесь, что после изменения публикации лента обновляется.'
+    )
+
+
+def test_feed_conditional_get(client, post_with_published_location):
+    for url in feed_urls(post_with_published_location):
+        etag = client.get(url)['ETag']
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+
+def test_feed_cache_follows_scheduled_post(
+        mixer, client, post_with_published_location
+):
+    post = post_with_published_location
+    scheduled = mixer.blend(
+        'blog.Post', category=post.category, image='', is_published=True,
+        pub_date=timezone.now() + timedelta(seconds=1),
+    )
+    assert scheduled.title not in read(client.get('/feed/'))
+    # Дата публикации наступает без сигнала
+    time.sleep(1.1)
+    assert scheduled.title in read(client.get('/feed/')), (
+        'Убедитесь, что кэш ленты обновляется, когда выходит отложенная'
+        ' публикация.'
+    )
+
+
+def test_unpublished_category_feed_not_found(mixer, client):
+    category = mixer.blend('blog.Category', is_published=False)
+    assert client.get(f'/category/{category.slug}/feed/').status_code == 404
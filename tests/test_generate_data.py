@@ -0,0 +1,77 @@
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db.models import Count, F, Max
+
+from blog.models import Category, Comment, Location, Post, User
+
+pytestmark = [pytest.mark.django_db]
+
+
+def generate(**options):
+    call_command(
+        'generate_blog_data',
+        users=10, categories=3, locations=4, posts=120, comments=600,
+        batch_size=50, stdout=StringIO(), **options
+    )
+
+
+def test_generate_blog_data():
+    generate(future_share=0.5)
+    assert (
+        Category.objects.count(), Location.objects.count(),
+        Post.objects.count(), Comment.objects.count(),
+    ) == (3, 4, 120, 600), (
+        'Убедитесь, что команда `generate_blog_data` создаёт заданное'
+        ' количество записей.'
+    )
+    assert not Post.objects.order_by().annotate(
+        actual=Count('comments')
+    ).exclude(comment_count=F('actual')).exists(), (
+        'Убедитесь, что после генерации счётчики комментариев верны.'
+    )
+    assert Post.objects.filter(pub_date__gt=Post.objects.latest(
+        'created_at').created_at).exists()
+
+
+def test_generate_blog_data_is_deterministic():
+    def run():
+        first_user = (User.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
+        generate(seed=7)
+        return [
+            (title, author_id - first_user, comment_count)
+            for title, author_id, comment_count in Post.objects.order_by(
+                'pk'
+            ).values_list('title', 'author_id', 'comment_count')
+        ]
+
+    first = run()
+    Post.objects.all().delete()
+    second = run()
+    assert first == second, (
+        'Убедитесь, что одинаковое зерно даёт одинаковые заголовки,'
+        ' авторов и число комментариев.'
+    )
+
+
+def test_generate_blog_data_uses_existing_rows():
+    generate()
+    call_command(
+        'generate_blog_data',
+        users=0, categories=0, locations=0, posts=10, comments=30,
+        stdout=StringIO(),
+    )
+    assert Post.objects.count() == 130
+    assert Post.objects.filter(pk__gt=120, category__isnull=False).exists(), (
+        'Убедитесь, что без новых категорий публикации ссылаются'
+        ' на существующие.'
+    )
+
+
+def test_generate_blog_data_without_authors():
+    with pytest.raises(CommandError):
+        call_command(
+            'generate_blog_data', users=0, posts=1, comments=0,
+            stdout=StringIO(),
+        )
@@ -0,0 +1,63 @@
+from io import BytesIO
+
+import pytest
+from bs4 import BeautifulSoup
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+
+from blog.images import RENDITIONS, FORMATS, rendition_name
+from tasks.utils import run_pending
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def post_with_image(post_with_published_location):
+    image_data = BytesIO()
+    Image.new('RGB', (1600, 900)).save(image_data, 'JPEG')
+    post = post_with_published_location
+    post.image = SimpleUploadedFile(
+        'rendition_test.jpg', image_data.getvalue(), content_type='image/jpeg'
+    )
+    post.save()
+    assert not post.image_dimensions, (
+        'Убедитесь, что изображение обрабатывается в фоновой задаче.'
+    )
+    run_pending()
+    post.refresh_from_db()
+    return post
+
+
+def test_renditions_generated_on_save(post_with_image):
+    assert post_with_image.image_dimensions == (1600, 900), (
+        'Убедитесь, что размеры изображения сохраняются в публикации.'
+    )
+    for rendition, width in RENDITIONS.items():
+        for fmt in FORMATS:
+            name = rendition_name(post_with_image.image.name, rendition, fmt)
+            assert default_storage.exists(name), (
+                f'Убедитесь, что создаётся копия изображения `{name}`.'
+            )
+            with default_storage.open(name) as file:
+                assert Image.open(file).size[0] == width
+
+
+def test_card_uses_renditions(user_client, post_with_image):
+    soup = BeautifulSoup(user_client.get('/').content, 'html.parser')
+    img = soup.find('picture').find('img')
+    assert img['loading'] == 'lazy'
+    assert (img['width'], img['height']) == ('640', '360')
+    assert '_card.jpeg' in img['src'] and '1200w' in img['srcset'], (
+        'Убедитесь, что карточка публикации выводит уменьшенные копии'
+        ' изображения.'
+    )
+
+
+def test_admin_shows_thumbnail(admin_client, post_with_image):
+    content = admin_client.get('/admin/blog/post/').content.decode()
+    thumb = rendition_name(post_with_image.image.name, 'thumb', 'jpeg')
+    assert thumb in content, (
+        'Убедитесь, что в списке публикаций админки выводится уменьшенная'
+        ' копия изображения.'
+    )
@@ -0,0 +1,51 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def get_post_list_plans(client, url):
+    with CaptureQueriesContext(connection) as ctx:
+        client.get(url)
+    plans = []
+    with connection.cursor() as cursor:
+        for query in ctx.captured_queries:
+            sql = query['sql']
+            if not (
+                sql.startswith('SELECT')
+                and 'FROM "blog_post"' in sql
+                and 'ORDER BY' in sql
+            ):
+                continue
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            plans.append([row[-1] for row in cursor.fetchall()])
+    return plans
+
+
+@pytest.mark.parametrize(
+    'url_template',
+    ['/', '/category/{slug}/', '/profile/{username}/'],
+    ids=['index', 'category', 'profile'],
+)
+def test_post_list_queries_use_indexes(
+        client, post_with_published_location, url_template
+):
+    post = post_with_published_location
+    url = url_template.format(
+        slug=post.category.slug, username=post.author.username
+    )
+    plans = get_post_list_plans(client, url)
+    assert plans, f'Не найден запрос списка публикаций для `{url}`.'
+    for plan in plans:
+        post_steps = [step for step in plan if 'blog_post' in step]
+        assert post_steps and all(
+            'USING' in step for step in post_steps
+        ), (
+            f'Убедитесь, что запрос публикаций для `{url}` использует индекс,'
+            f' а не полный просмотр таблицы: {plan}'
+        )
+        assert 'USE TEMP B-TREE FOR ORDER BY' not in plan, (
+            f'Убедитесь, что сортировка публикаций для `{url}` выполняется'
+            f' по индексу: {plan}'
+        )
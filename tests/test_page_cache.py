@@ -0,0 +1,110 @@
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_anonymous_pages_are_cached(
+        client, post_with_published_location, django_assert_num_queries
+):
+    post = post_with_published_location
+    urls = (
+        '/',
+        f'/category/{post.category.slug}/',
+        f'/profile/{post.author.username}/',
+        f'/posts/{post.id}/',
+    )
+    for url in urls:
+        client.get(url)
+    with django_assert_num_queries(0):
+        for url in urls:
+            assert client.get(url).status_code == 200
+
+
+def test_page_cache_invalidated_on_post_change(
+        client, post_with_published_location
+):
+    post = post_with_published_location
+    urls = (
+        '/',
+        f'/category/{post.category.slug}/',
+        f'/profile/{post.author.username}/',
+        f'/posts/{post.id}/',
+    )
+    for url in urls:
+        client.get(url)
+
+    post.title = 'Обновлённый заголовок публикации'
+    post.save()
+    for url in urls:
+        assert post.title in client.get(url).content.decode(), (
+            f'Убедитесь, что после изменения публикации страница `{url}`'
+            ' не отдаётся из кэша.'
+        )
+
+
+def test_page_cache_invalidated_on_comment(
+        mixer, client, post_with_published_location
+):
+    post = post_with_published_location
+    client.get('/')
+    client.get(f'/posts/{post.id}/')
+
+    comment = mixer.blend('blog.Comment', post=post, text='Свежий отзыв')
+    assert 'Комментарии (1)' in client.get('/').content.decode()
+    assert comment.text in client.get(f'/posts/{post.id}/').content.decode()
+
+
+def test_page_cache_skips_other_categories(
+        client, post_with_published_location, post_with_another_category,
+        django_assert_num_queries
+):
+    url = f'/category/{post_with_another_category.category.slug}/'
+    client.get(url)
+
+    post_with_published_location.title = 'Новый заголовок'
+    post_with_published_location.save()
+    with django_assert_num_queries(0):
+        client.get(url)
+
+
+def test_logged_in_pages_are_not_cached(
+        user_client, post_with_published_location
+):
+    url = f'/posts/{post_with_published_location.id}/'
+    user_client.get(url)
+    assert user_client.get(url).context is not None
+
+
+def test_post_cards_are_cached(user_client, post_with_published_location):
+    post = post_with_published_location
+    user_client.get('/')
+
+    # Обновление без сигналов не меняет версию карточки
+    type(post).objects.filter(pk=post.pk).update(title='Тихая правка')
+    assert 'Тихая правка' not in user_client.get('/').content.decode(), (
+        'Убедитесь, что карточки публикаций в ленте кэшируются.'
+    )
+
+    post.title = 'Правка с сигналом'
+    post.save()
+    assert 'Правка с сигналом' in user_client.get('/').content.decode(), (
+        'Убедитесь, что карточка публикации обновляется после её изменения.'
+    )
+
+
+def test_post_card_follows_category(
+        user_client, post_with_published_location
+):
+    category = post_with_published_location.category
+    user_client.get('/profile/{}/'.format(
+        post_with_published_location.author.username
+    ))
+    category.title = 'Переименованная категория'
+    category.save()
+    response = user_client.get('/profile/{}/'.format(
+        post_with_published_location.author.username
+    ))
+    assert category.title in response.content.decode(), (
+        'Убедитесь, что карточка публикации обновляется после изменения'
+        ' её категории.'
+    )
@@ -0,0 +1,50 @@
+import re
+
+import pytest
+from django.test import override_settings
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+def get_page_ids(response):
+    return [post.id for post in response.context['page_obj']]
+
+
+@override_settings(BLOG_CURSOR_PAGINATION=True)
+def test_cursor_pagination(user_client, many_posts_with_published_locations):
+    url = f'/profile/{many_posts_with_published_locations[0].author}/'
+    first = user_client.get(url)
+    first_ids = get_page_ids(first)
+    assert len(first_ids) == N_PER_PAGE, (
+        'Убедитесь, что при курсорной пагинации на странице выводится'
+        f' {N_PER_PAGE} публикаций.'
+    )
+    assert '?page=' not in first.content.decode(), (
+        'Убедитесь, что при курсорной пагинации не выводятся ссылки'
+        ' с номерами страниц.'
+    )
+
+    after = re.search(r'\?after=([\w-]+)', first.content.decode()).group(1)
+    second = user_client.get(url, {'after': after})
+    second_ids = get_page_ids(second)
+    assert len(second_ids) == N_PER_PAGE
+    assert not set(first_ids) & set(second_ids), (
+        'Убедитесь, что курсор `?after=` ведёт на следующую страницу.'
+    )
+    assert not second.context['page_obj'].has_next()
+
+    before = re.search(
+        r'\?before=([\w-]+)', second.content.decode()
+    ).group(1)
+    back = user_client.get(url, {'before': before})
+    assert get_page_ids(back) == first_ids, (
+        'Убедитесь, что курсор `?before=` ведёт на предыдущую страницу.'
+    )
+
+
+@override_settings(BLOG_CURSOR_PAGINATION=True)
+def test_cursor_pagination_invalid_token(user_client):
+    response = user_client.get('/', {'after': 'not-a-cursor'})
+    assert response.status_code == 404
@@ -0,0 +1,100 @@
+import pytest
+from django.test import override_settings
+from django.urls import reverse
+
+from blog import urls as blog_urls
+from blog.middleware import get_query_budget
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.mark.usefixtures('comment_to_a_post')
+def test_post_detail_queries_for_author(
+        user_client, post_with_published_location,
+        django_assert_num_queries
+):
+    # Сессия, пользователь, публикация, комментарии
+    with django_assert_num_queries(4):
+        user_client.get(f'/posts/{post_with_published_location.id}/')
+
+
+@pytest.mark.usefixtures('comment_to_a_post')
+def test_post_detail_queries_for_anonymous(
+        client, post_with_published_location, django_assert_num_queries
+):
+    # Публикация, комментарии
+    with django_assert_num_queries(2):
+        client.get(f'/posts/{post_with_published_location.id}/')
+
+
+def test_category_page_queries(
+        client, post_with_published_location, django_assert_num_queries
+):
+    # Дата последней публикации для ETag, категория, количество
+    # публикаций, публикации
+    with django_assert_num_queries(4):
+        client.get(
+            f'/category/{post_with_published_location.category.slug}/'
+        )
+
+
+def test_profile_page_queries(
+        user_client, post_with_published_location, django_assert_num_queries
+):
+    # Сессия, пользователь, автор, количество публикаций, публикации
+    with django_assert_num_queries(5):
+        user_client.get(
+            f'/profile/{post_with_published_location.author.username}/'
+        )
+
+
+def test_edit_comment_page_queries(
+        mixer, user, user_client, post_with_published_location,
+        django_assert_num_queries
+):
+    comment = mixer.blend(
+        'blog.Comment', post=post_with_published_location, author=user
+    )
+    # Сессия, пользователь, комментарий
+    with django_assert_num_queries(3):
+        user_client.get(
+            f'/posts/{post_with_published_location.id}'
+            f'/edit_comment/{comment.id}/'
+        )
+
+
+@pytest.mark.parametrize(
+    'pattern', blog_urls.urlpatterns, ids=lambda pattern: pattern.name
+)
+def test_views_fit_query_budget(
+        mixer, user, user_client, post_with_published_location, pattern
+):
+    post = post_with_published_location
+    comment = mixer.blend('blog.Comment', post=post, author=user)
+    known_kwargs = {
+        'post_id': post.id,
+        'comment_id': comment.id,
+        'category_slug': post.category.slug,
+        'username': user.username,
+        'kind': 'category',
+    }
+    view_name = f'blog:{pattern.name}'
+    url = reverse(view_name, kwargs={
+        name: known_kwargs[name] for name in pattern.pattern.converters
+    })
+
+    response = user_client.get(url)
+    budget = get_query_budget(view_name)
+    assert response.status_code == 200
+    assert response.query_stats.count <= budget['queries'], (
+        f'Страница `{url}` выполняет {response.query_stats.count} запросов'
+        f' при бюджете {budget["queries"]}.'
+    )
+
+
+@override_settings(SERVER_TIMING_HEADER=True)
+def test_server_timing_header(client):
+    response = client.get('/')
+    assert response['Server-Timing'].startswith('db;dur='), (
+        'Убедитесь, что ответ содержит заголовок Server-Timing.'
+    )
@@ -0,0 +1,111 @@
+import sqlite3
+
+import pytest
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+from blog.routers import PIN_COOKIE
+
+pytestmark = [
+    pytest.mark.django_db(transaction=True, databases=['default', 'replica'])
+]
+
+
+@pytest.fixture
+def replica(settings):
+    settings.DATABASE_REPLICAS = ['replica']
+    settings.BLOG_PAGE_CACHE_TIMEOUT = 0
+
+
+@pytest.fixture
+def separate_replica(replica, tmp_path, post_with_published_location):
+    """Реплика — отдельная база-снимок основной, а не её зеркало."""
+    conn = connections['replica']
+    mirrored = conn.settings_dict
+    conn.close()
+    path = tmp_path / 'replica.sqlite3'
+    snapshot = sqlite3.connect(path)
+    connections['default'].ensure_connection()
+    connections['default'].connection.backup(snapshot)
+    snapshot.close()
+    conn.settings_dict = {**mirrored, 'NAME': str(path)}
+    yield
+    conn.close()
+    conn.settings_dict = mirrored
+
+
+def capture(alias):
+    return CaptureQueriesContext(connections[alias])
+
+
+def test_reads_go_to_replica(replica, client, post_with_published_location):
+    post = post_with_published_location
+    for url in (
+        '/',
+        f'/category/{post.category.slug}/',
+        f'/profile/{post.author.username}/',
+        f'/posts/{post.id}/',
+    ):
+        with capture('default') as primary, capture('replica') as replica:
+            assert client.get(url).status_code == 200
+        assert replica.captured_queries and not primary.captured_queries, (
+            f'Убедитесь, что страница `{url}` читает данные из реплики.'
+        )
+
+
+def test_write_pins_reads_to_primary(
+        replica, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    response = user_client.post(
+        f'/posts/{post.id}/comment/', data={'text': 'Новый комментарий'}
+    )
+    assert PIN_COOKIE in response.cookies, (
+        'Убедитесь, что после записи браузер закрепляется за основной базой.'
+    )
+    with capture('replica') as replica:
+        content = user_client.get(f'/posts/{post.id}/').content.decode()
+    assert not replica.captured_queries
+    assert 'Новый комментарий' in content
+
+
+def test_no_replicas_configured(client, post_with_published_location):
+    with capture('replica') as replica:
+        client.get('/')
+    assert not replica.captured_queries
+
+
+def test_separate_replica_serves_reads(separate_replica, client):
+    with capture('default') as primary, capture('replica') as replica:
+        assert client.get('/').status_code == 200
+    assert replica.captured_queries and not primary.captured_queries
+
+
+def test_login_is_read_from_primary(
+        separate_replica, client, user, post_with_published_location
+):
+    client.force_login(user)
+    response = client.get(f'/posts/{post_with_published_location.id}/')
+    assert response.context['user'] == user, (
+        'Убедитесь, что сессия и пользователь читаются из основной базы,'
+        ' а не из реплики, куда они ещё не попали.'
+    )
+
+
+def test_write_pins_separate_replica(
+        separate_replica, client, post_with_published_location
+):
+    post = post_with_published_location
+    client.force_login(post.author)
+    response = client.post(
+        f'/posts/{post.id}/comment/', data={'text': 'Свежий комментарий'}
+    )
+    assert PIN_COOKIE in response.cookies
+    content = client.get(f'/posts/{post.id}/').content.decode()
+    assert 'Свежий комментарий' in content, (
+        'Убедитесь, что после записи страница читается из основной базы,'
+        ' а не из отстающей реплики.'
+    )
+    client.cookies.pop(PIN_COOKIE)
+    content = client.get(f'/posts/{post.id}/').content.decode()
+    assert 'Свежий комментарий' not in content
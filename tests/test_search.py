@@ -0,0 +1,81 @@
+import pytest
+from django.db import connection
+
+from blog.search import FTS_TABLE, build_match
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_build_match_quotes_words():
+    assert build_match('Морской "бриз" OR NEAR(') == (
+        '"морской"* "бриз"* "or"* "near"*'
+    )
+    assert build_match('  ?! ') == ''
+
+
+def test_search_ranks_published_posts(
+        mixer, client, post_with_published_location, published_category
+):
+    post = post_with_published_location
+    post.title = 'Прогулка по набережной'
+    post.text = 'Набережная и море.'
+    post.save()
+    other = mixer.blend(
+        'blog.Post', author=post.author, category=published_category,
+        is_published=True, title='Разное', text='Набережная в дождь.',
+        pub_date=post.pub_date, image='',
+    )
+    mixer.blend(
+        'blog.Post', author=post.author, category=published_category,
+        is_published=False, title='Набережная черновик', image='',
+    )
+
+    response = client.get('/search/', {'q': 'набережн'})
+    assert response.status_code == 200
+    assert [found.pk for found in response.context['page_obj']] == [
+        post.pk, other.pk
+    ], (
+        'Убедитесь, что поиск находит только опубликованные посты и'
+        ' ставит выше совпадения в заголовке и тексте.'
+    )
+
+
+def test_search_index_follows_post_changes(post_with_published_location):
+    post = post_with_published_location
+
+    def indexed():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT title FROM {FTS_TABLE} WHERE rowid = %s', [post.pk]
+            )
+            return cursor.fetchone()
+
+    post.title = 'Новое название'
+    post.save()
+    assert indexed() == ('Новое название',)
+    post.delete()
+    assert indexed() is None
+
+
+def test_admin_search_uses_index(admin_client, post_with_published_location):
+    post = post_with_published_location
+    post.title = 'Уникальное заглавие'
+    post.save()
+    response = admin_client.get('/admin/blog/post/', {'q': 'заглав'})
+    assert list(response.context['cl'].result_list) == [post]
+
+
+def test_search_without_fts5_falls_back_to_icontains(
+        monkeypatch, client, post_with_published_location
+):
+    post = post_with_published_location
+    post.title = 'Прогулка по набережной'
+    post.save()
+    monkeypatch.setattr('blog.search.is_supported', lambda alias: False)
+    response = client.get('/search/', {'q': 'набережн'})
+    assert response.status_code == 200
+    assert [found.pk for found in response.context['page_obj']] == [
+        post.pk
+    ], (
+        'Убедитесь, что без FTS5 поиск работает по вхождению слов.'
+    )
@@ -0,0 +1,105 @@
+import re
+import time
+from io import StringIO
+from types import SimpleNamespace
+
+import pytest
+from django.contrib.auth.tokens import default_token_generator
+from django.core import mail
+from django.core.management import call_command
+
+from tasks.models import Task
+from tasks.utils import enqueue, run_pending
+
+pytestmark = [pytest.mark.django_db]
+
+CALLS = []
+
+
+def record_call(value):
+    CALLS.append(value)
+
+
+def always_fail():
+    raise RuntimeError('Ошибка задачи')
+
+
+def test_task_runs_in_worker():
+    CALLS.clear()
+    enqueue('test_tasks.record_call', ['значение'])
+    assert not CALLS, 'Убедитесь, что задача не выполняется сразу.'
+    assert run_pending() == [True]
+    assert CALLS == ['значение']
+    assert not Task.objects.exists(), (
+        'Убедитесь, что выполненная задача удаляется из очереди.'
+    )
+
+
+def test_failed_task_is_retried():
+    task = enqueue('test_tasks.always_fail', max_attempts=2)
+    run_pending()
+    task.refresh_from_db()
+    assert (task.status, task.attempts) == (Task.PENDING, 1), (
+        'Убедитесь, что задача с ошибкой возвращается в очередь.'
+    )
+    assert run_pending() == [], (
+        'Убедитесь, что повтор задачи откладывается.'
+    )
+
+    Task.objects.update(run_at=task.created_at)
+    run_pending()
+    task.refresh_from_db()
+    assert (task.status, task.attempts) == (Task.FAILED, 2)
+    assert 'Ошибка задачи' in task.last_error
+
+
+def test_password_reset_email_is_queued(client, user):
+    user.email = 'reader@example.com'
+    user.save()
+    client.post('/auth/password_reset/', {'email': user.email})
+    assert not mail.outbox, (
+        'Убедитесь, что письмо для сброса пароля отправляется в фоне.'
+    )
+    task = Task.objects.get()
+    assert '/reset/' not in task.arguments, (
+        'Убедитесь, что ссылка для сброса пароля не хранится в очереди.'
+    )
+    run_pending()
+    assert len(mail.outbox) == 1
+    assert mail.outbox[0].to == [user.email]
+    link = re.search(r'/auth/reset/(\S+)/(\S+)/', mail.outbox[0].body)
+    assert link and link[2] not in task.arguments
+    assert default_token_generator.check_token(user, link[2]), (
+        'Убедитесь, что письмо содержит действующую ссылку для сброса.'
+    )
+
+
+def sleep_and_record(value, seconds):
+    time.sleep(seconds)
+    CALLS.append(value)
+
+
+class QueueDrained(Exception):
+    pass
+
+
+@pytest.mark.django_db(transaction=True)
+def test_worker_does_not_wait_for_slow_task(monkeypatch):
+    CALLS.clear()
+    enqueue('test_tasks.sleep_and_record', ['медленная', 1])
+    for number in range(3):
+        enqueue('test_tasks.sleep_and_record', [number, 0.05])
+
+    def stop(seconds):
+        raise QueueDrained
+
+    monkeypatch.setattr(
+        'tasks.management.commands.runworker.time', SimpleNamespace(sleep=stop)
+    )
+    with pytest.raises(QueueDrained):
+        call_command('runworker', concurrency=2, poll_interval=0.01,
+                     stdout=StringIO())
+    assert CALLS == [0, 1, 2, 'медленная'], (
+        'Убедитесь, что свободные потоки воркера берут новые задачи,'
+        ' не дожидаясь самой долгой.'
+    )